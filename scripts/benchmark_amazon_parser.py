@@ -0,0 +1,135 @@
+"""
+Compare the BeautifulSoup and lxml parser backends of AmazonScraper on saved search pages.
+
+For every fixture the two backends must return identical results; then each is timed over
+`--repeat` parses and its peak traced memory for one parse is measured with tracemalloc.
+tracemalloc only sees allocations made through Python, so libxml2's own tree memory (the
+same for both backends, since BeautifulSoup parses with lxml too) is not counted.
+
+Usage (from the repository root):
+    python scripts/benchmark_amazon_parser.py [page.html ...] [--repeat 20]
+    python scripts/benchmark_amazon_parser.py --write-fixture scripts/fixtures/amazon_search_synthetic.html
+
+Without arguments, every .html file in scripts/fixtures is used.
+"""
+import argparse
+import glob
+import html
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from scrapers.amazon_scraper import AmazonScraper  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def build_fixture(results=60) -> str:
+    """
+    Build a synthetic search page shaped like Amazon's markup, covering the variants the
+    parser has to handle: sponsored links, missing prices and ratings, the fallback name
+    class, entities, non-ASCII text and comments.
+    """
+    items = []
+    for i in range(results):
+        asin = f"B{i:09d}"
+        name_class = "a-size-base-plus a-color-base a-text-normal" if i % 5 else "a-size-medium a-text-normal"
+        href = f"/sspa/click?ie=UTF8&amp;url=%2FProduct-{i}%2Fdp%2F{asin}" if i % 7 == 0 else f"/Product-{i}/dp/{asin}/ref=sr_1_{i}"
+        price = (
+            f'<span class="a-price"><span class="a-offscreen">${i},{i % 100:02d}</span>'
+            f'<span class="a-price-whole">{i + 1},{i % 10}99<span class="a-price-decimal">.</span></span>'
+            f'<span class="a-price-fraction">{i % 100:02d}</span></span>'
+            if i % 6 else ""
+        )
+        rating = (
+            f'<i class="a-icon a-icon-star-small"><span class="a-icon-alt">{3 + i % 3}.{i % 10} out of 5 stars</span></i>'
+            if i % 4 else ""
+        )
+        description = (
+            f'<span class="a-size-base-plus a-color-base">Brand {i} &amp; Co.</span>' if i % 3 == 0 else ""
+        )
+        items.append(
+            f"""
+<div data-component-type="s-search-result" data-asin="{asin}" class="s-result-item s-asin sg-col-0-of-12">
+  <div class="sg-col-inner"><div class="s-widget-container">
+    <div class="puis-card-container">
+      <span data-component-type="s-product-image">
+        <a class="a-link-normal s-no-outline" href="{href}"><img class="s-image" src="https://m.media-amazon.com/images/I/{asin}.jpg" alt=""></a>
+      </span>
+      <!-- {html.escape(f"ad slot {i}")} -->
+      <div class="a-section a-spacing-none">{description}
+        <h2 class="a-size-mini"><a class="a-link-normal s-link-style a-text-normal" href="{href}">
+          <span class="{name_class}"> Wireless Headphones Modèle {i} – Noise Cancelling, 30h &quot;Battery&quot; </span>
+        </a></h2>
+      </div>
+      <div class="a-row a-size-small">{rating}<span class="a-size-base s-underline-text">{i * 37:,}</span></div>
+      <div class="a-row"><a class="a-link-normal s-no-hover" href="{href}">{price}</a></div>
+      <script>window.P && P.when('A').execute(function(){{ /* {asin} */ }});</script>
+    </div>
+  </div></div>
+</div>"""
+        )
+    return (
+        '<!doctype html><html lang="en-ca"><head><meta charset="utf-8"><title>Amazon.ca : headphones</title>'
+        "<style>.s-result-item{margin:0}</style></head><body>"
+        '<div class="s-main-slot s-result-list">' + "".join(items) + "</div></body></html>"
+    )
+
+
+def measure(scraper, content: bytes, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        scraper.parse_html(content)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    scraper.parse_html(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"median_ms": statistics.median(timings) * 1000, "min_ms": min(timings) * 1000, "peak_kib": peak / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", nargs="*", help="Saved Amazon search result pages")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed parses per backend and fixture")
+    parser.add_argument("--write-fixture", metavar="PATH", help="Write the synthetic fixture to PATH and exit")
+    args = parser.parse_args()
+
+    if args.write_fixture:
+        with open(args.write_fixture, "w", encoding="utf-8") as f:
+            f.write(build_fixture())
+        print(f"Wrote {args.write_fixture}")
+        return
+
+    paths = args.fixtures or sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+    fixtures = [(os.path.basename(path), open(path, "rb").read()) for path in paths]
+    if not fixtures:
+        fixtures = [("synthetic", build_fixture().encode("utf-8"))]
+
+    scrapers = {backend: AmazonScraper(parser=backend) for backend in ("bs4", "lxml")}
+    for name, content in fixtures:
+        expected = scrapers["bs4"].parse_html(content)
+        actual = scrapers["lxml"].parse_html(content)
+        if actual != expected:
+            mismatches = [(a, b) for a, b in zip(expected, actual) if a != b]
+            print(f"{name}: results differ ({len(expected)} vs {len(actual)} products), first mismatch: {mismatches[:1]}")
+            sys.exit(1)
+
+        stats = {backend: measure(scraper, content, args.repeat) for backend, scraper in scrapers.items()}
+        print(f"{name}: {len(content) / 1024:.0f} KiB, {len(expected)} products, identical results")
+        for backend, result in stats.items():
+            print(
+                f"  {backend:<5} median {result['median_ms']:8.2f} ms   min {result['min_ms']:8.2f} ms   "
+                f"peak traced memory {result['peak_kib']:9.0f} KiB"
+            )
+        print(f"  lxml speedup: {stats['bs4']['median_ms'] / stats['lxml']['median_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
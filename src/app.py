@@ -1,24 +1,189 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_file, send_from_directory, stream_with_context, url_for
 from scraper_manager import ScraperManager
+from result_cache import create_result_cache
+from job_queue import JobQueue, JobQueueFull, InMemoryJobStore, SQLiteJobStore
+from bulk_pipeline import BulkScrapePipeline, read_search_terms
+from checkpoint_store import CheckpointStore
+from product_store import ProductStore, parse_number
+from result_writers import INCREMENTAL_WRITERS, RESULT_EXTENSIONS, RESULT_WRITERS, missing_engine, open_incremental_writer
+import io
+import json
 import os
+import re
+import threading
+import uuid
 from logger_config import get_logger
 
 # Initialize Flask app
 app = Flask(__name__)
 
-# Initialize ScraperManager
-scraper_manager = ScraperManager()
+# Search-result cache. RESULT_CACHE_BACKEND is one of "memory" (default), "sqlite", "redis",
+# "inprocess-redis" or "none"; freshness is per retailer, after which entries are served
+# stale while a background refresh runs. Results missing a failed or timed-out retailer are
+# only fresh for RESULT_CACHE_PARTIAL_TTL.
+result_cache = create_result_cache(
+    os.environ.get("RESULT_CACHE_BACKEND", "memory"),
+    redis_url=os.environ.get("REDIS_URL"),
+    default_ttl=int(os.environ.get("RESULT_CACHE_TTL", "3600")),
+    retailer_ttls={
+        "amazon": int(os.environ.get("RESULT_CACHE_TTL_AMAZON", "1800")),
+        "bestbuy": int(os.environ.get("RESULT_CACHE_TTL_BESTBUY", "3600")),
+    },
+    stale_ttl=int(os.environ.get("RESULT_CACHE_STALE_TTL", "21600")),
+    partial_ttl=int(os.environ.get("RESULT_CACHE_PARTIAL_TTL", "300")),
+)
+
+# Products from every scrape accumulate here, deduplicated by retailer product id.
+# Set PRODUCT_STORE_PATH=none to disable.
+PRODUCT_STORE_PATH = os.environ.get("PRODUCT_STORE_PATH", os.path.join(os.getcwd(), "cache", "products.sqlite3"))
+product_store = ProductStore(PRODUCT_STORE_PATH) if PRODUCT_STORE_PATH != "none" else None
+
+# Initialize ScraperManager. CLASSIFIER_BACKEND selects "zero-shot" (default) or the "embedding" fast path.
+# INFERENCE_BACKEND runs both models as "torch" (default), "int8" (dynamic quantization) or
+# "onnx" (ONNX Runtime); check a backend first with `python src/model_backends.py --backend int8`.
+# Model inference runs on batching workers that merge concurrent requests for up to
+# INFERENCE_BATCH_WINDOW_MS milliseconds; set it to "off" to run inference on request threads.
+# RELEVANCE_MIN_LEXICAL_SCORE (0-1, default 0 = off) skips embedding products whose text covers
+# less than that fraction of the search term's words; check `lexical_miss` in /cache_stats first.
+INFERENCE_BATCH_WINDOW_MS = os.environ.get("INFERENCE_BATCH_WINDOW_MS", "5")
+scraper_manager = ScraperManager(
+    classifier_backend=os.environ.get("CLASSIFIER_BACKEND", "zero-shot"),
+    result_cache=result_cache,
+    product_store=product_store,
+    batch_window_ms=None if INFERENCE_BATCH_WINDOW_MS == "off" else float(INFERENCE_BATCH_WINDOW_MS),
+    inference_backend=os.environ.get("INFERENCE_BACKEND", "torch"),
+    min_lexical_score=float(os.environ.get("RELEVANCE_MIN_LEXICAL_SCORE", "0")),
+)
 
 # Set up directories for data and logs
 DATA_DIR = os.path.join(os.getcwd(), "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# Uploaded bulk term files are kept apart from result files
+UPLOADS_DIR = os.path.join(os.getcwd(), "uploads")
+os.makedirs(UPLOADS_DIR, exist_ok=True)
+
 #LOGS_DIR = os.path.join(os.getcwd(), "logs")
 #os.makedirs(LOGS_DIR, exist_ok=True)
 
 # Get logger
 logger = get_logger(__name__)
 
+# Upper bound on terms accepted by /classify_batch
+MAX_CLASSIFY_BATCH = int(os.environ.get("MAX_CLASSIFY_BATCH", "1000"))
+
+# Models load lazily on first use. Unless WARM_UP_MODELS=0 they are loaded on a background
+# thread at startup, so health checks pass immediately and /ready reports when loading is done.
+WARM_UP_MODELS = os.environ.get("WARM_UP_MODELS", "1") != "0"
+
+# Optional file of popular search terms used to pre-warm the classification cache
+CLASSIFIER_WARM_TERMS_FILE = os.environ.get("CLASSIFIER_WARM_TERMS_FILE")
+
+def warm_up():
+    """
+    Load models and pre-warm the classification cache.
+    """
+    if WARM_UP_MODELS:
+        scraper_manager.warm_up(background=False)
+    if CLASSIFIER_WARM_TERMS_FILE:
+        try:
+            warmed = scraper_manager.classifier.warm_cache(CLASSIFIER_WARM_TERMS_FILE)
+            logger.info(f"Pre-warmed classification cache with {warmed} terms from {CLASSIFIER_WARM_TERMS_FILE}")
+        except OSError as e:
+            logger.error(f"Failed to pre-warm classification cache: {str(e)}", exc_info=True)
+
+# Under the preforking server (serve.py) the parent process warms up before forking workers,
+# and background threads are started in each worker by `start_background_services`
+PREFORK_SERVER = os.environ.get("PREFORK_SERVER") == "1"
+
+if (WARM_UP_MODELS or CLASSIFIER_WARM_TERMS_FILE) and not PREFORK_SERVER:
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+def run_scrape_job(payload, progress):
+    """
+    Background handler for an async /scrape request.
+    """
+    search_term = payload["search_term"]
+    if payload.get("delta"):
+        delta = scraper_manager.fetch_delta(search_term, progress=progress)
+        output_file = scraper_manager.save_results(
+            delta["added"] + delta["price_changed"], f"{search_term}_delta", DATA_DIR, payload.get("format", "xlsx")
+        )
+        return dict(delta, search_term=search_term, file=output_file)
+    results = scraper_manager.fetch_data(search_term, progress=progress)
+    output_file = scraper_manager.save_results(results, search_term, DATA_DIR, payload.get("format", "xlsx"))
+    return {"search_term": search_term, "file": output_file, "results": results}
+
+def run_bulk_scrape_job(payload, progress):
+    """
+    Background handler for /bulk_scrape: streams terms from the uploaded file through the
+    bulk pipeline, appending each term's results to the output file as it completes.
+    Completed terms are checkpointed, so a job resumed after a restart skips them.
+    """
+    output_file = payload["output_file"]
+    checkpoint = CheckpointStore(CHECKPOINT_DB, payload["output_file"])
+    writer = open_incremental_writer(payload["format"], output_file)
+    try:
+        bulk_pipeline.run(read_search_terms(payload["terms_file"]), writer, progress, checkpoint)
+    finally:
+        writer.close()
+    return dict(checkpoint.summary(read_search_terms(payload["terms_file"])), file=output_file)
+
+# Client-chosen bulk run ids end up in file names, so only plain names are accepted
+BULK_RUN_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+# Per-term completion records for bulk runs
+CHECKPOINT_DB = os.environ.get("CHECKPOINT_DB", os.path.join(os.getcwd(), "checkpoints", "bulk.sqlite3"))
+
+# Bulk pipeline: BULK_CONCURRENCY terms in flight on its own scraper pool, with per-retailer caps
+# on concurrent bulk scrapes (interactive scrapes are not capped)
+bulk_pipeline = BulkScrapePipeline(
+    scraper_manager,
+    max_concurrent_terms=int(os.environ.get("BULK_CONCURRENCY", "4")),
+    retailer_limits={
+        "amazon": int(os.environ.get("BULK_AMAZON_CONCURRENCY", "1")),
+        "bestbuy": int(os.environ.get("BULK_BESTBUY_CONCURRENCY", "2")),
+    },
+)
+
+# Background job queue for async scrapes. Set JOB_STORE_PATH to persist jobs in SQLite so
+# queued and interrupted jobs resume after a restart.
+JOB_STORE_PATH = os.environ.get("JOB_STORE_PATH")
+job_queue = JobQueue(
+    {"scrape": run_scrape_job, "bulk_scrape": run_bulk_scrape_job},
+    store=SQLiteJobStore(JOB_STORE_PATH) if JOB_STORE_PATH else InMemoryJobStore(),
+    max_workers=int(os.environ.get("JOB_WORKERS", "2")),
+    max_pending=int(os.environ.get("JOB_MAX_PENDING", "100")),
+)
+
+def start_background_services(resume_jobs=True):
+    """
+    Start the background job workers. Runs at import, or in each forked worker under serve.py.
+
+    Args:
+        resume_jobs (bool): Re-enqueue jobs left unfinished by a previous run.
+    """
+    job_queue.start(resume=resume_jobs)
+
+if not PREFORK_SERVER:
+    start_background_services()
+
+def submit_job(kind, payload, **response_fields):
+    """
+    Queue a background job and return a 202 response pointing at its status URL.
+    Extra keyword arguments are added to the response body.
+    """
+    try:
+        job = job_queue.submit(kind, payload)
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": url_for("get_job", job_id=job.id),
+        **response_fields,
+    }), 202
+
 @app.route("/")
 def index():
     """
@@ -26,6 +191,15 @@ def index():
     """
     return jsonify({"message": "Welcome to the Enhanced Scraper API!"})
 
+@app.route("/ready")
+def ready():
+    """
+    Readiness endpoint reporting which models are loaded and their load times.
+    Returns 503 until every model is loaded.
+    """
+    status = scraper_manager.model_status()
+    return jsonify(status), 200 if status["ready"] else 503
+
 @app.route("/classify", methods=["POST"])
 def classify():
     """
@@ -46,11 +220,47 @@ def classify():
         logger.error(f"Error in /classify endpoint: {str(e)}", exc_info=True)
         return jsonify({"error": "An error occurred while processing your request."}), 500
 
+@app.route("/classify_batch", methods=["POST"])
+def classify_batch():
+    """
+    Endpoint to classify many search terms at once.
+    Input JSON: ["term 1", "term 2", ...] or {"search_terms": ["term 1", "term 2", ...]}
+    """
+    try:
+        data = request.get_json()
+        search_terms = data.get("search_terms") if isinstance(data, dict) else data
+        if not isinstance(search_terms, list) or not search_terms:
+            return jsonify({"error": "Expected a non-empty JSON list of search terms"}), 400
+        if not all(isinstance(term, str) and term.strip() for term in search_terms):
+            return jsonify({"error": "Every search term must be a non-empty string"}), 400
+        if len(search_terms) > MAX_CLASSIFY_BATCH:
+            return jsonify({"error": f"At most {MAX_CLASSIFY_BATCH} search terms per request"}), 400
+
+        predictions = scraper_manager.classifier.classify_batch(search_terms)
+        logger.info(f"Classified batch of {len(search_terms)} search terms")
+        return jsonify({
+            "results": [
+                {"search_term": term, "category": prediction["label"], "scores": prediction["scores"]}
+                for term, prediction in zip(search_terms, predictions)
+            ]
+        })
+    except Exception as e:
+        logger.error(f"Error in /classify_batch endpoint: {str(e)}", exc_info=True)
+        return jsonify({"error": "An error occurred while processing your request."}), 500
+
 @app.route("/scrape", methods=["POST"])
 def scrape():
     """
     Endpoint to scrape data based on a search term.
-    Input JSON: {"search_term": "product name"}
+    Input JSON: {"search_term": "product name", "format": "xlsx"}
+    "format" (or `?format=`) picks the saved file type: xlsx (default), parquet, csv.gz or jsonl.
+    The file is written in the background and appears in /data_files once complete.
+    Add `?delta=1` (or "delta": true) to scrape incrementally: only new or changed products are
+    scored, the response lists added, removed and price-changed products since the previous
+    delta run of the term, and only added and price-changed products are saved.
+    Add `?async=1` (or "async": true) to get a job id back immediately and poll /jobs/<job_id>.
+    Add `?stream=1` (or send `Accept: application/x-ndjson`) to receive results as
+    newline-delimited JSON while the scrape is still running.
     """
     try:
         data = request.get_json()
@@ -58,26 +268,188 @@ def scrape():
         if not search_term:
             return jsonify({"error": "Missing 'search_term' in request"}), 400
 
+        output_format = request.args.get("format") or data.get("format") or "xlsx"
+        if output_format not in RESULT_WRITERS:
+            return jsonify({"error": f"Unsupported format '{output_format}'. Expected one of {sorted(RESULT_WRITERS)}"}), 400
+        engine = missing_engine(output_format)
+        if engine:
+            return jsonify({"error": f"Format '{output_format}' requires '{engine}', which is not installed"}), 400
+
+        delta = request.args.get("delta") in ("1", "true") or data.get("delta") is True
+        if delta and scraper_manager.product_store is None:
+            return jsonify({"error": "Delta scraping requires the product store"}), 400
+
+        if request.args.get("async") in ("1", "true") or data.get("async") is True:
+            return submit_job("scrape", {"search_term": search_term, "format": output_format, "delta": delta})
+
+        if delta:
+            result = scraper_manager.fetch_delta(search_term)
+            output_file = scraper_manager.save_results(
+                result["added"] + result["price_changed"], f"{search_term}_delta", DATA_DIR, output_format, background=True
+            )
+            logger.info(f"Delta scrape completed for term '{search_term}', saving to {output_file}")
+            return jsonify(dict(result, message="Delta scrape completed successfully!", file=output_file))
+
+        if request.args.get("stream") in ("1", "true") or request.accept_mimetypes.best == "application/x-ndjson":
+            return stream_scrape(search_term, output_format)
+
         # Fetch data using ScraperManager
         results = scraper_manager.fetch_data(search_term)
 
-        # Save results to Excel file
-        output_file = os.path.join(DATA_DIR, f"{search_term.replace(' ', '_')}_results.xlsx")
-        scraper_manager.save_results_to_excel(results, output_file)
+        # Save results off the request thread
+        output_file = scraper_manager.save_results(results, search_term, DATA_DIR, output_format, background=True)
 
-        logger.info(f"Scraping completed for term '{search_term}', saved to {output_file}")
+        logger.info(f"Scraping completed for term '{search_term}', saving to {output_file}")
         return jsonify({"message": "Scraping completed successfully!", "file": output_file, "results": results})
     except Exception as e:
         logger.error(f"Error in /scrape endpoint: {str(e)}", exc_info=True)
         return jsonify({"error": "An error occurred while processing your request."}), 500
 
+def stream_scrape(search_term, output_format="xlsx"):
+    """
+    Stream results for `search_term` as NDJSON: one product per line as soon as its scraper
+    and relevance batch finish, then a final `{"done": true, ...}` line naming the saved file,
+    or an `{"error": ...}` line if the scrape fails part-way.
+    """
+    def generate():
+        results = []
+        try:
+            for batch in scraper_manager.iter_data(search_term):
+                results.extend(batch)
+                for result in batch:
+                    yield json.dumps(result, default=str) + "\n"
+            output_file = scraper_manager.save_results(results, search_term, DATA_DIR, output_format, background=True)
+            logger.info(f"Streamed scrape completed for term '{search_term}', saving to {output_file}")
+            yield json.dumps({"done": True, "count": len(results), "file": output_file}) + "\n"
+        except Exception as e:
+            logger.error(f"Error while streaming /scrape results: {str(e)}", exc_info=True)
+            yield json.dumps({"error": "An error occurred while processing your request."}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@app.route("/bulk_scrape", methods=["POST"])
+def bulk_scrape():
+    """
+    Endpoint to scrape many search terms as a background job.
+    Input: an uploaded text file ("file", one term per line) or JSON {"search_terms": [...]},
+    plus an optional "format" (jsonl, csv, csv.gz or parquet; default jsonl).
+    Pass a "run_id" (letters, digits, '-' or '_') to name the run; resubmitting with the same
+    run_id and format resumes it, skipping terms already done and appending to its output file.
+    Without one, a new run id is generated and returned.
+    Returns a job id; poll /jobs/<job_id> for progress and the output file.
+    """
+    try:
+        file = request.files.get("file")
+        data = {} if file else request.get_json(silent=True) or {}
+        params = request.form if file else data
+        output_format = params.get("format", "jsonl")
+        if output_format not in INCREMENTAL_WRITERS:
+            return jsonify({"error": f"Unsupported format '{output_format}'. Expected one of {sorted(INCREMENTAL_WRITERS)}"}), 400
+        engine = missing_engine(output_format)
+        if engine:
+            return jsonify({"error": f"Format '{output_format}' requires '{engine}', which is not installed"}), 400
+
+        run_id = params.get("run_id") or uuid.uuid4().hex
+        if not isinstance(run_id, str) or not BULK_RUN_ID_PATTERN.fullmatch(run_id):
+            return jsonify({"error": "'run_id' must be 1-64 letters, digits, '-' or '_'"}), 400
+        terms_file = os.path.join(UPLOADS_DIR, f"bulk_{run_id}.txt")
+
+        if file:
+            file.save(terms_file)
+        else:
+            search_terms = data.get("search_terms")
+            if not isinstance(search_terms, list):
+                return jsonify({"error": "Expected 'search_terms' to be a JSON list of search terms"}), 400
+            search_terms = [term.strip() for term in search_terms if isinstance(term, str) and term.strip()]
+            if not search_terms:
+                return jsonify({"error": "No search terms provided"}), 400
+            with open(terms_file, "w", encoding="utf-8") as f:
+                f.write("\n".join(search_terms) + "\n")
+
+        return submit_job("bulk_scrape", {
+            "terms_file": terms_file,
+            "format": output_format,
+            "output_file": os.path.join(DATA_DIR, f"bulk_{run_id}.{output_format}"),
+        }, run_id=run_id)
+    except Exception as e:
+        logger.error(f"Error in /bulk_scrape endpoint: {str(e)}", exc_info=True)
+        return jsonify({"error": "An error occurred while processing your request."}), 500
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """
+    Endpoint to poll a background job for status, progress and (once finished) results.
+    Pass `?include_results=0` to omit the result payload.
+    """
+    try:
+        job = job_queue.get(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify(job.to_dict(include_result=request.args.get("include_results", "1") != "0"))
+    except Exception as e:
+        logger.error(f"Error in /jobs/{job_id} endpoint: {str(e)}", exc_info=True)
+        return jsonify({"error": "An error occurred while retrieving the job."}), 500
+
+@app.route("/cache_stats", methods=["GET"])
+def cache_stats():
+    """
+    Endpoint to report hit/miss counters for the model caches.
+    """
+    try:
+        return jsonify(scraper_manager.cache_stats())
+    except Exception as e:
+        logger.error(f"Error in /cache_stats endpoint: {str(e)}", exc_info=True)
+        return jsonify({"error": "An error occurred while retrieving cache stats."}), 500
+
+@app.route("/products", methods=["GET"])
+def list_products():
+    """
+    Endpoint to look up stored products without scraping.
+    Query parameters (all optional): search_term, retailer, min_price, max_price, limit (1-1000, default 100).
+    """
+    if product_store is None:
+        return jsonify({"error": "Product store is disabled"}), 404
+    try:
+        min_price = request.args.get("min_price")
+        max_price = request.args.get("max_price")
+        products = product_store.search(
+            search_term=request.args.get("search_term"),
+            retailer=request.args.get("retailer"),
+            min_price=parse_number(min_price) if min_price else None,
+            max_price=parse_number(max_price) if max_price else None,
+            limit=max(1, min(int(request.args.get("limit", 100)), 1000)),  # SQLite treats a negative LIMIT as none
+        )
+        return jsonify({"products": products})
+    except ValueError:
+        return jsonify({"error": "'limit' must be an integer"}), 400
+    except Exception as e:
+        logger.error(f"Error in /products endpoint: {str(e)}", exc_info=True)
+        return jsonify({"error": "An error occurred while looking up products."}), 500
+
+@app.route("/products/<retailer>/<product_id>/history", methods=["GET"])
+def product_history(retailer, product_id):
+    """
+    Endpoint to get the recorded price and rating changes of one product.
+    """
+    if product_store is None:
+        return jsonify({"error": "Product store is disabled"}), 404
+    try:
+        history = product_store.price_history(retailer, product_id)
+        if not history:
+            return jsonify({"error": "Product not found"}), 404
+        return jsonify({"retailer": retailer, "product_id": product_id, "history": history})
+    except Exception as e:
+        logger.error(f"Error in /products/{retailer}/{product_id}/history endpoint: {str(e)}", exc_info=True)
+        return jsonify({"error": "An error occurred while retrieving the price history."}), 500
+
 @app.route("/data_files", methods=["GET"])
 def list_data_files():
     """
     Endpoint to list all available data files in the 'data' directory.
     """
     try:
-        files = [f for f in os.listdir(DATA_DIR) if f.endswith(".xlsx")]
+        # Skip hidden names, which are exports still being written
+        files = [f for f in os.listdir(DATA_DIR) if f.endswith(RESULT_EXTENSIONS) and not f.startswith(".")]
         return jsonify({"files": files})
     except Exception as e:
         logger.error(f"Error in /data_files endpoint: {str(e)}", exc_info=True)
@@ -87,10 +459,19 @@ def list_data_files():
 def download_file(filename):
     """
     Endpoint to download a specific data file from the 'data' directory.
+    A bulk Parquet output (a directory of part files) is downloaded as a single Parquet file.
     """
     try:
+        path = os.path.join(DATA_DIR, filename)
+        if filename.endswith(".parquet") and os.path.isdir(path):
+            import pandas as pd
+            buffer = io.BytesIO()
+            pd.read_parquet(path).to_parquet(buffer, index=False)
+            buffer.seek(0)
+            return send_file(buffer, mimetype="application/octet-stream", as_attachment=True, download_name=filename)
+
         # Ensure the file exists in the data directory
-        if not os.path.isfile(os.path.join(DATA_DIR, filename)):
+        if not os.path.isfile(path):
             return jsonify({"error": "File not found"}), 404
 
         return send_from_directory(DATA_DIR, filename, as_attachment=True)
@@ -0,0 +1,194 @@
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from checkpoint_store import CheckpointStore
+from logger_config import get_logger
+from result_writers import open_incremental_writer
+from scraper_pool import ScraperPool
+from text_utils import normalize_search_term
+
+
+def read_search_terms(path: str):
+    """
+    Lazily yield search terms from a text file, one per line, skipping blanks and '#' comments.
+
+    Args:
+        path (str): Path to the terms file.
+
+    Yields:
+        str: Each search term.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            term = line.strip()
+            if term and not term.startswith("#"):
+                yield term
+
+
+class BulkScrapePipeline:
+    """
+    Scrapes a stream of search terms concurrently and writes each term's results as soon as
+    it completes.
+
+    Terms are read lazily and classified in batches; at most `max_concurrent_terms` terms are
+    in flight at once, so memory use does not grow with the size of the input. Results are
+    never accumulated: each finished term is appended to the writer, so a crash keeps every
+    term written before it. With a CheckpointStore, completed terms are recorded and skipped
+    when the same run is started again. A term whose scrapers or pages failed (blocked,
+    errored or timed out) is recorded as partial if it still produced results and as failed
+    otherwise; a term without results or failures is recorded as empty. None of these is
+    skipped on resume.
+
+    Scrapes run on the pipeline's own ScraperPool, so `retailer_limits` caps bulk scrapes
+    only and interactive requests on the manager's pool never queue behind them.
+    """
+    def __init__(self, scraper_manager, max_concurrent_terms=4, retailer_limits=None, classify_batch_size=32,
+                 logger=None):
+        self.scraper_manager = scraper_manager
+        self.max_concurrent_terms = max_concurrent_terms
+        self.classify_batch_size = classify_batch_size
+        self.logger = logger or get_logger(__name__)
+        # Enough workers for every scraper of every term in flight
+        scrapers_per_term = max((len(scrapers) for scrapers in scraper_manager.scrapers.values()), default=1)
+        self.scraper_pool = ScraperPool(
+            max_workers=max(1, max_concurrent_terms * scrapers_per_term),
+            retailer_limits=retailer_limits,
+            name="bulk-scraper",
+        )
+
+    def run(self, search_terms, writer, progress=None, checkpoint=None) -> dict:
+        """
+        Scrape every term and write its results.
+
+        Args:
+            search_terms (iterable): Search terms; may be a lazy generator.
+            writer: A writer from `open_incremental_writer`. Open it in append mode when resuming.
+            progress (callable): Optional `progress(counter, amount)` reporter; receives
+                "terms_done", "terms_partial", "terms_failed", "terms_empty", "terms_skipped" and
+                "results_written"
+                plus the scrape counters.
+            checkpoint (CheckpointStore): Optional store; terms it already marks done are skipped
+                and every finished term is recorded in it.
+
+        Returns:
+            dict: Counts of terms done, partial, failed, empty and skipped and results written in
+                this invocation.
+        """
+        summary = {
+            "terms_done": 0, "terms_partial": 0, "terms_failed": 0, "terms_empty": 0, "terms_skipped": 0,
+            "results_written": 0,
+        }
+        summary_lock = threading.Lock()
+        write_lock = threading.Lock()
+        slots = threading.BoundedSemaphore(self.max_concurrent_terms)
+        completed = checkpoint.completed_terms() if checkpoint else set()
+        if completed:
+            self.logger.info(f"Resuming run '{checkpoint.run_id}': {len(completed)} terms already done")
+
+        def _record(counter, amount=1):
+            with summary_lock:
+                summary[counter] += amount
+            if progress:
+                progress(counter, amount)
+
+        def _scrape_term(search_term, category):
+            failures = {"scrapers_failed": 0, "pages_failed": 0}
+
+            def _term_progress(counter, amount=1):
+                if counter in failures:
+                    failures[counter] += amount
+                if progress:
+                    progress(counter, amount)
+
+            try:
+                results = self.scraper_manager.fetch_data(
+                    search_term, category=category, progress=_term_progress, pool=self.scraper_pool
+                )
+                rows = [dict(result, **{"Search Term": search_term, "Category": category}) for result in results]
+                # Scrape errors are swallowed per retailer, so results may be missing a blocked retailer
+                failed = any(failures.values())
+                error = f"{failures['scrapers_failed']} scrapers and {failures['pages_failed']} pages failed"
+                if not rows:
+                    if failed:
+                        error = f"No results; {error}"
+                        if checkpoint:
+                            checkpoint.mark_failed(search_term, error)
+                        _record("terms_failed")
+                        self.logger.warning(f"Bulk term '{search_term}' failed: {error}")
+                    else:
+                        if checkpoint:
+                            checkpoint.mark_empty(search_term)
+                        _record("terms_empty")
+                        self.logger.info(f"Bulk term '{search_term}' ({category}) returned no results")
+                    return
+                with write_lock:
+                    writer.write(rows)
+                _record("results_written", len(rows))
+                if failed:
+                    if checkpoint:
+                        checkpoint.mark_partial(search_term, len(rows), error)
+                    _record("terms_partial")
+                    self.logger.warning(f"Bulk term '{search_term}' partial with {len(rows)} results: {error}")
+                else:
+                    if checkpoint:
+                        checkpoint.mark_done(search_term, len(rows))
+                    _record("terms_done")
+                    self.logger.info(f"Bulk term '{search_term}' done with {len(rows)} results")
+            except Exception as e:
+                if checkpoint:
+                    checkpoint.mark_failed(search_term, str(e))
+                _record("terms_failed")
+                self.logger.error(f"Bulk term '{search_term}' failed: {str(e)}", exc_info=True)
+            finally:
+                slots.release()
+
+        seen = set()
+
+        def _pending_terms():
+            # Skip terms finished by an earlier invocation, and repeats within the input
+            for search_term in search_terms:
+                key = normalize_search_term(search_term)
+                if key in completed or key in seen:
+                    _record("terms_skipped")
+                    continue
+                seen.add(key)
+                yield search_term
+
+        terms = _pending_terms()
+        with ThreadPoolExecutor(max_workers=self.max_concurrent_terms, thread_name_prefix="bulk") as executor:
+            while True:
+                batch = list(islice(terms, self.classify_batch_size))
+                if not batch:
+                    break
+                predictions = self.scraper_manager.classifier.classify_batch(batch)
+                for search_term, prediction in zip(batch, predictions):
+                    slots.acquire()  # Blocks until a term slot frees up, bounding work in flight
+                    executor.submit(_scrape_term, search_term, prediction["label"])
+
+        self.logger.info(f"Bulk run finished: {summary}")
+        return summary
+
+
+if __name__ == "__main__":
+    from scraper_manager import ScraperManager
+
+    parser = argparse.ArgumentParser(description="Scrape every search term in a file.")
+    parser.add_argument("terms_file", help="Text file with one search term per line")
+    parser.add_argument("output", help="Output file (or directory for parquet)")
+    parser.add_argument("--format", default="jsonl", choices=["jsonl", "csv", "parquet"])
+    parser.add_argument("--concurrency", type=int, default=4, help="Terms scraped in parallel")
+    parser.add_argument("--checkpoint", help="SQLite checkpoint file; rerun with the same file to resume")
+    parser.add_argument("--run-id", help="Checkpoint run id (defaults to the output path)")
+    args = parser.parse_args()
+
+    checkpoint_store = CheckpointStore(args.checkpoint, args.run_id or args.output) if args.checkpoint else None
+    pipeline = BulkScrapePipeline(ScraperManager(), max_concurrent_terms=args.concurrency)
+    output_writer = open_incremental_writer(args.format, args.output)
+    try:
+        print(pipeline.run(read_search_terms(args.terms_file), output_writer, checkpoint=checkpoint_store))
+    finally:
+        output_writer.close()
+    if checkpoint_store:
+        print(checkpoint_store.summary(read_search_terms(args.terms_file)))
@@ -1,25 +1,255 @@
-from transformers import pipeline
+from inference_batcher import MicroBatcher
+from model_backends import INFERENCE_BACKENDS, load_zero_shot_pipeline
+from model_loader import LazyModel
+from text_utils import normalize_search_term
+from ttl_cache import TTLCache
+import numpy as np
+import threading
+import time
 
 class CategoryClassifier:
-    def __init__(self):
-        # Load a zero-shot classification pipeline
-        self.classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
+    BACKENDS = ("zero-shot", "embedding")
+    ZERO_SHOT_MODEL_NAME = "facebook/bart-large-mnli"
+
+    def __init__(self, cache_size=4096, cache_ttl=24 * 60 * 60, backend="zero-shot", embedding_model=None,
+                 margin_threshold=0.05, batch_window_ms=None, batch_size=16, inference_backend="torch"):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown classifier backend '{backend}'. Expected one of {self.BACKENDS}")
+        if backend == "embedding" and embedding_model is None:
+            raise ValueError("The 'embedding' backend requires an embedding_model")
+
+        if inference_backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend '{inference_backend}'. Expected one of {INFERENCE_BACKENDS}")
+
+        # Zero-shot classification pipeline on the selected inference backend, loaded on first use
+        self.inference_backend = inference_backend
+        self.zero_shot_model = LazyModel(
+            self.ZERO_SHOT_MODEL_NAME if inference_backend == "torch" else f"{self.ZERO_SHOT_MODEL_NAME} ({inference_backend})",
+            lambda: load_zero_shot_pipeline(self.ZERO_SHOT_MODEL_NAME, inference_backend),
+        )
         self.categories = {
             "Electronics": ["smartphone", "laptop", "tablet", "TV", "camera", "robot vacuum"],
             "Appliances": ["refrigerator", "microwave", "washing machine"],
             "Fashion": ["shoes", "clothing", "accessories"],
             "Groceries": ["food", "snacks", "beverages", "groceries"],
         }
+        # Predictions keyed by normalized search term, so repeated queries skip the model
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+
+        # Embedding fast path: compare the term against per-category centroids built from the
+        # keyword lists above, and fall back to zero-shot when the top-two margin is too small.
+        self.backend = backend
+        self._embedding_model = embedding_model  # A model with `encode`, or a LazyModel wrapping one
+        self.margin_threshold = margin_threshold
+        self._centroids = None
+        self._centroid_lock = threading.Lock()
+        self.embedding_predictions = 0
+        self.zero_shot_fallbacks = 0
+
+        # With a batch window, cache misses from all threads are classified together on one worker
+        self.batch_size = batch_size
+        self.batcher = (
+            MicroBatcher("classifier", lambda terms: self._predict(terms, self.batch_size),
+                         max_batch_size=batch_size * 2, max_wait_ms=batch_window_ms)
+            if batch_window_ms is not None else None
+        )
+
+    @property
+    def classifier(self):
+        return self.zero_shot_model.get()
+
+    @property
+    def embedding_model(self):
+        if isinstance(self._embedding_model, LazyModel):
+            return self._embedding_model.get()
+        return self._embedding_model
 
     def classify(self, search_term: str) -> str:
+        return self.classify_with_scores(search_term)["label"]
+
+    def classify_with_scores(self, search_term: str) -> dict:
+        """
+        Classify a search term and return the full score distribution.
+
+        Args:
+            search_term (str): The term to classify.
+
+        Returns:
+            dict: {"label": top category, "scores": {category: score}}.
+        """
+        return self.classify_batch([search_term])[0]
+
+    def classify_batch(self, search_terms: list, batch_size=16) -> list:
+        """
+        Classify many search terms, running cache misses through the pipeline in padded batches.
+
+        Terms that normalize to the same key are classified once.
+
+        Args:
+            search_terms (list): The terms to classify.
+            batch_size (int): Number of terms per forward pass. Ignored when a batching worker
+                is configured, which uses the constructor's `batch_size`.
+
+        Returns:
+            list: One {"label", "scores"} dict per input term, in input order.
+        """
+        keys = [normalize_search_term(term) for term in search_terms]
+        predictions = {}
+        pending = {}  # normalized key -> first original spelling, sent to the model
+        for term, key in zip(search_terms, keys):
+            if key in predictions or key in pending:
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                predictions[key] = cached
+            else:
+                pending[key] = term
+
+        if pending:
+            try:
+                if self.batcher is not None:
+                    new_predictions = self.batcher.run(list(pending.values()))
+                else:
+                    new_predictions = self._predict(list(pending.values()), batch_size)
+                for key, prediction in zip(pending, new_predictions):
+                    self.cache.set(key, prediction)
+                    predictions[key] = prediction
+            except Exception as e:
+                print(f"Error during classification: {e}")
+
+        unknown = {"label": "Unknown", "scores": {}}
+        return [
+            dict(prediction, scores=dict(prediction["scores"]))
+            for prediction in (predictions.get(key, unknown) for key in keys)
+        ]
+
+    def compare_backends(self, search_terms: list, batch_size=16) -> dict:
+        """
+        Measure how often the embedding backend agrees with zero-shot, bypassing the cache.
+
+        Args:
+            search_terms (list): Evaluation terms.
+            batch_size (int): Number of terms per zero-shot forward pass.
+
+        Returns:
+            dict: Agreement rate, timings, the share of terms that would fall back to
+            zero-shot, and the terms the two backends disagree on.
+        """
+        if self._embedding_model is None:
+            raise ValueError("compare_backends requires an embedding_model")
+
+        start = time.perf_counter()
+        zero_shot = self._zero_shot_predict(search_terms, batch_size)
+        zero_shot_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        embedding, margins = self._embedding_predict(search_terms)
+        embedding_seconds = time.perf_counter() - start
+
+        disagreements = [
+            {"search_term": term, "zero_shot": reference["label"], "embedding": candidate["label"], "margin": margin}
+            for term, reference, candidate, margin in zip(search_terms, zero_shot, embedding, margins)
+            if reference["label"] != candidate["label"]
+        ]
+        total = len(search_terms)
+        return {
+            "terms": total,
+            "agreement": (total - len(disagreements)) / total if total else 0.0,
+            "fallback_rate": sum(margin < self.margin_threshold for margin in margins) / total if total else 0.0,
+            "zero_shot_seconds": zero_shot_seconds,
+            "embedding_seconds": embedding_seconds,
+            "disagreements": disagreements,
+        }
+
+    def _predict(self, search_terms: list, batch_size: int) -> list:
+        """
+        Run the configured backend over uncached terms.
+        """
+        if self.backend != "embedding":
+            return self._zero_shot_predict(search_terms, batch_size)
+
+        predictions, margins = self._embedding_predict(search_terms)
+        fallback = [i for i, margin in enumerate(margins) if margin < self.margin_threshold]
+        self.embedding_predictions += len(search_terms) - len(fallback)
+        self.zero_shot_fallbacks += len(fallback)
+        if fallback:
+            fallback_predictions = self._zero_shot_predict([search_terms[i] for i in fallback], batch_size)
+            for i, prediction in zip(fallback, fallback_predictions):
+                predictions[i] = prediction
+        return predictions
+
+    def _zero_shot_predict(self, search_terms: list, batch_size: int) -> list:
+        """
+        Classify terms with the zero-shot NLI pipeline.
+        """
         # Flatten category options
         category_labels = list(self.categories.keys())
-        try:
-            result = self.classifier(search_term, candidate_labels=category_labels)
-            return result["labels"][0]  # Top predicted category
-        except Exception as e:
-            print(f"Error during classification: {e}")
-            return "Unknown"
+        results = self.classifier(search_terms, candidate_labels=category_labels, batch_size=batch_size)
+        if isinstance(results, dict):
+            results = [results]
+        return [
+            {
+                "label": result["labels"][0],  # Top predicted category
+                "scores": dict(zip(result["labels"], result["scores"])),
+                "backend": "zero-shot",
+            }
+            for result in results
+        ]
+
+    def _embedding_predict(self, search_terms: list):
+        """
+        Classify terms by cosine similarity to the category centroids.
+
+        Returns:
+            tuple: (predictions, margins) where each margin is the gap between the top two similarities.
+        """
+        labels, centroids = self._get_centroids()
+        term_embeddings = self.embedding_model.encode(search_terms, normalize_embeddings=True)
+        similarities = np.asarray(term_embeddings) @ centroids.T
+
+        predictions = []
+        margins = []
+        for row in similarities:
+            ranked = np.argsort(row)[::-1]
+            predictions.append({
+                "label": labels[ranked[0]],
+                "scores": {labels[i]: float(row[i]) for i in ranked},
+                "backend": "embedding",
+            })
+            margins.append(float(row[ranked[0]] - row[ranked[1]]) if len(ranked) > 1 else float("inf"))
+        return predictions, margins
+
+    def _get_centroids(self):
+        """
+        Build (once) the normalized mean embedding of each category's name and keywords.
+        """
+        with self._centroid_lock:
+            if self._centroids is None:
+                labels = list(self.categories.keys())
+                centroids = []
+                for label in labels:
+                    embeddings = self.embedding_model.encode([label] + self.categories[label], normalize_embeddings=True)
+                    centroid = np.mean(embeddings, axis=0)
+                    centroids.append(centroid / np.linalg.norm(centroid))
+                self._centroids = (labels, np.stack(centroids))
+            return self._centroids
+
+    def warm_cache(self, terms_file: str) -> int:
+        """
+        Pre-populate the prediction cache from a file of popular search terms.
+
+        Args:
+            terms_file (str): Path to a text file with one search term per line. Blank lines
+                and lines starting with '#' are ignored.
+
+        Returns:
+            int: Number of distinct terms classified.
+        """
+        with open(terms_file, "r", encoding="utf-8") as f:
+            terms = [line.strip() for line in f]
+        terms = [term for term in terms if term and not term.startswith("#")]
+        self.classify_batch(terms)
+        return len({normalize_search_term(term) for term in terms})
 
 # Testing the classifier
 if __name__ == "__main__":
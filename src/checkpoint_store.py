@@ -0,0 +1,101 @@
+import time
+
+from fork_utils import SQLiteConnection
+from text_utils import normalize_search_term
+
+DONE = "done"
+FAILED = "failed"
+EMPTY = "empty"  # Finished without results or scraper failures; retried on resume like FAILED
+PARTIAL = "partial"  # Results written, but some scrapers or pages failed; retried on resume like FAILED
+
+
+class CheckpointStore:
+    """
+    Records per-term completion of a bulk run in SQLite so an interrupted run can resume.
+
+    Terms are tracked by normalized spelling within a `run_id`. Completion is recorded after
+    a term's results are written, so a crash between the two can repeat (never lose) that
+    term's rows on resume. Only done terms are skipped on resume; failed, empty and partial
+    terms are scraped again, so a partial term's rows can appear more than once in the output.
+    """
+    def __init__(self, db_path: str, run_id: str):
+        self.db_path = db_path
+        self.run_id = run_id
+        self._db = SQLiteConnection(db_path)
+        with self._db.lock:
+            self._db.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    run_id TEXT NOT NULL,
+                    term TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    results INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (run_id, term)
+                )
+                """
+            )
+            self._db.conn.commit()
+
+    def mark_done(self, search_term: str, results_count: int):
+        self._record(search_term, DONE, results_count, None)
+
+    def mark_failed(self, search_term: str, error: str):
+        self._record(search_term, FAILED, 0, error)
+
+    def mark_empty(self, search_term: str):
+        self._record(search_term, EMPTY, 0, None)
+
+    def mark_partial(self, search_term: str, results_count: int, error: str):
+        self._record(search_term, PARTIAL, results_count, error)
+
+    def completed_terms(self) -> set:
+        """
+        Return the normalized terms already completed in this run.
+        """
+        with self._db.lock:
+            rows = self._db.conn.execute(
+                "SELECT term FROM checkpoints WHERE run_id = ? AND status = ?", (self.run_id, DONE)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def summary(self, search_terms=None) -> dict:
+        """
+        Summarize progress of the run.
+
+        Args:
+            search_terms (iterable): The run's full term list. When given, terms without a
+                checkpoint are counted as pending.
+
+        Returns:
+            dict: Counts of done, partial, failed, empty and (if computable) pending terms, plus
+                results written.
+        """
+        with self._db.lock:
+            rows = self._db.conn.execute(
+                "SELECT term, status, results FROM checkpoints WHERE run_id = ?", (self.run_id,)
+            ).fetchall()
+        statuses = {term: status for term, status, _ in rows}
+        summary = {
+            "run_id": self.run_id,
+            "done": sum(status == DONE for status in statuses.values()),
+            "partial": sum(status == PARTIAL for status in statuses.values()),
+            "failed": sum(status == FAILED for status in statuses.values()),
+            "empty": sum(status == EMPTY for status in statuses.values()),
+            "pending": None,
+            "results_written": sum(results for _, status, results in rows if status in (DONE, PARTIAL)),
+        }
+        if search_terms is not None:
+            all_terms = {normalize_search_term(term) for term in search_terms}
+            summary["pending"] = len(all_terms - statuses.keys())
+        return summary
+
+    def _record(self, search_term, status, results_count, error):
+        with self._db.lock:
+            self._db.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (run_id, term, status, results, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.run_id, normalize_search_term(search_term), status, results_count, error, time.time()),
+            )
+            self._db.conn.commit()
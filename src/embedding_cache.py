@@ -0,0 +1,166 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from fork_utils import SQLiteConnection, after_fork_in_child
+from logger_config import get_logger
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache for sentence embeddings keyed by a hash of the model name and text.
+
+    The first tier is an in-memory LRU of float32 vectors. The optional second tier is a
+    SQLite database of float16 vectors that survives restarts; disk hits are promoted
+    into the memory tier.
+    """
+    # SQLite limits the number of bound parameters per statement
+    _SQL_CHUNK_SIZE = 500
+
+    def __init__(self, model_name: str, max_memory_items=10000, db_path=None, logger=None):
+        self.model_name = model_name
+        self.max_memory_items = max_memory_items
+        self.db_path = db_path
+        self.logger = logger or get_logger(__name__)
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        # Disk tier, used under its own lock so encodes hitting the memory tier never wait on disk I/O
+        self._db = None
+        if db_path:
+            self._db = SQLiteConnection(db_path)
+            self._db.conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._db.conn.commit()
+            self.logger.info(f"Embedding cache opened at {db_path}")
+        after_fork_in_child(self._reset_after_fork)
+
+    def _reset_after_fork(self):
+        # Another thread may have held the lock at fork time
+        self._lock = threading.Lock()
+
+    def make_key(self, text: str) -> str:
+        """
+        Build the cache key for a text.
+
+        Args:
+            text (str): The text that was (or will be) embedded.
+
+        Returns:
+            str: Hex digest of the model name and text.
+        """
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: list) -> list:
+        """
+        Look up embeddings for several texts.
+
+        Args:
+            texts (list): Texts to look up.
+
+        Returns:
+            list: One float32 numpy array per text, or None where the text is not cached.
+        """
+        keys = [self.make_key(text) for text in texts]
+        found = [None] * len(keys)
+        disk_lookups = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                embedding = self._memory.get(key)
+                if embedding is not None:
+                    self._memory.move_to_end(key)
+                    found[i] = embedding
+                    self.memory_hits += 1
+                else:
+                    disk_lookups.setdefault(key, []).append(i)
+
+        from_disk = {}
+        if disk_lookups and self._db is not None:
+            with self._db.lock:
+                from_disk = self._read_from_disk(list(disk_lookups))
+
+        with self._lock:
+            for key, embedding in from_disk.items():
+                for i in disk_lookups.pop(key):
+                    found[i] = embedding
+                    self.disk_hits += 1
+                self._remember(key, embedding)
+
+            self.misses += sum(len(indices) for indices in disk_lookups.values())
+
+        return found
+
+    def put_many(self, texts: list, embeddings):
+        """
+        Store embeddings for several texts in both tiers.
+
+        Args:
+            texts (list): Texts that were embedded.
+            embeddings (iterable): Matching embedding vectors.
+        """
+        rows = []
+        with self._lock:
+            for text, embedding in zip(texts, embeddings):
+                key = self.make_key(text)
+                embedding = np.asarray(embedding, dtype=np.float32)
+                self._remember(key, embedding)
+                rows.append((key, embedding.shape[0], embedding.astype(np.float16).tobytes()))
+
+        if rows and self._db is not None:
+            with self._db.lock:
+                try:
+                    self._db.conn.executemany("INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)", rows)
+                    self._db.conn.commit()
+                except sqlite3.Error as e:
+                    self.logger.error(f"Failed to persist embeddings: {e}", exc_info=True)
+
+    def stats(self) -> dict:
+        """
+        Report cache hit/miss counters.
+
+        Returns:
+            dict: Hit and miss counts, hit rate and memory tier size.
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "model": self.model_name,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "persistent": self._db is not None,
+            }
+
+    def _remember(self, key, embedding):
+        # Caller must hold self._lock
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _read_from_disk(self, keys: list) -> dict:
+        # Caller must hold self._db.lock
+        found = {}
+        try:
+            for i in range(0, len(keys), self._SQL_CHUNK_SIZE):
+                chunk = keys[i:i + self._SQL_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._db.conn.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                )
+                for key, dim, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float16, count=dim).astype(np.float32)
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to read embeddings from disk: {e}", exc_info=True)
+        return found
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import threading
+import weakref
+
+# SQLite connections inherited from a parent process. A child must neither use nor close
+# them (closing can checkpoint the parent's WAL underneath it), so they are parked here.
+_inherited_connections = []
+
+
+def after_fork_in_child(method):
+    """
+    Call a bound method in every child process right after `os.fork()`.
+
+    Only a weak reference to the method's object is kept, so registering does not keep the
+    object alive.
+
+    Args:
+        method: Bound method taking no arguments.
+    """
+    ref = weakref.WeakMethod(method)
+
+    def _callback():
+        bound = ref()
+        if bound is not None:
+            bound()
+
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_callback)
+
+
+class SQLiteConnection:
+    """
+    A SQLite connection shared by threads, opened in WAL mode and reopened in each child
+    process after `fork()`.
+
+    Callers hold `lock` around every use of `conn`. Both are replaced in a forked child:
+    the inherited connection is parked unused and the lock, which another thread may have
+    held at fork time, is recreated.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        after_fork_in_child(self._reopen)
+
+    def _reopen(self):
+        _inherited_connections.append(self.conn)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
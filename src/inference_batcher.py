@@ -0,0 +1,137 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from fork_utils import after_fork_in_child
+from logger_config import get_logger
+
+
+class _Request:
+    __slots__ = ("items", "future")
+
+    def __init__(self, items, future):
+        self.items = items
+        self.future = future
+
+
+class MicroBatcher:
+    """
+    Runs a batch function on a dedicated worker thread, merging concurrent callers' inputs
+    into micro-batches.
+
+    The worker takes the first waiting request, then keeps collecting requests for up to
+    `max_wait_ms` or until `max_batch_size` items are queued, and calls `fn` once on all of
+    them. Each caller gets back the slice of outputs for its own items. A single worker per
+    model serializes inference, so concurrent requests share larger forward passes instead
+    of competing for the CPU with many small ones.
+
+    `fn(items) -> outputs` must return one output per input item, in order. An exception
+    raised by `fn` is re-raised in every caller of that batch.
+    """
+    def __init__(self, name: str, fn, max_batch_size=64, max_wait_ms=5, logger=None):
+        self.name = name
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.logger = logger or get_logger(__name__)
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.items = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        after_fork_in_child(self._reset_after_fork)
+
+    def submit(self, items: list) -> Future:
+        """
+        Queue items for the next batch.
+
+        Args:
+            items (list): Inputs for `fn`.
+
+        Returns:
+            Future: Resolves to the list of outputs for `items`.
+        """
+        future = Future()
+        if not items:
+            future.set_result([])
+            return future
+        self._ensure_started()
+        self._queue.put(_Request(list(items), future))
+        return future
+
+    def run(self, items: list) -> list:
+        """
+        Queue items and wait for their outputs.
+        """
+        return self.submit(items).result()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "requests": self.requests,
+                "items": self.items,
+                "batches": self.batches,
+                "avg_batch_items": self.items / self.batches if self.batches else 0.0,
+                "avg_requests_per_batch": self.requests / self.batches if self.batches else 0.0,
+                "max_batch_items": self.max_batch_seen,
+                "queued": self._queue.qsize(),
+            }
+
+    def _reset_after_fork(self):
+        # The worker thread does not survive fork(); a child starts its own on first use
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                worker = threading.Thread(target=self._work, name=f"batcher-{self.name}", daemon=True)
+                worker.start()
+                self._worker = worker
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        size = len(batch[0].items)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.items)
+        return batch
+
+    def _work(self):
+        while True:
+            batch = self._collect()
+            items = [item for request in batch for item in request.items]
+            try:
+                outputs = self.fn(items)
+            except Exception as e:
+                self.logger.error(f"Batched inference '{self.name}' failed for {len(items)} items: {e}", exc_info=True)
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            start = 0
+            for request in batch:
+                end = start + len(request.items)
+                request.future.set_result(list(outputs[start:end]))
+                start = end
+
+            with self._stats_lock:
+                self.requests += len(batch)
+                self.items += len(items)
+                self.batches += 1
+                self.max_batch_seen = max(self.max_batch_seen, len(items))
@@ -0,0 +1,262 @@
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from fork_utils import SQLiteConnection
+from logger_config import get_logger
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """
+    Raised when a job is submitted while the queue already holds `max_pending` jobs.
+    """
+
+
+class Job:
+    """
+    A unit of background work with status, progress counters and a JSON-serializable result.
+    """
+    def __init__(self, kind: str, payload: dict, job_id=None, status=QUEUED, progress=None, result=None,
+                 error=None, created_at=None, started_at=None, finished_at=None):
+        self.id = job_id or uuid.uuid4().hex
+        self.kind = kind
+        self.payload = payload
+        self.status = status
+        self.progress = progress or {}
+        self.result = result
+        self.error = error
+        self.created_at = created_at or time.time()
+        self.started_at = started_at
+        self.finished_at = finished_at
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self, include_result=True) -> dict:
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": dict(self.progress),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobProgress:
+    """
+    Callable progress reporter handed to job handlers: `progress("pages_fetched", 1)`.
+
+    Safe to call from any thread the handler fans out to. Counters update the job at once, but
+    it is saved at most every `save_interval` seconds; JobQueue saves it again when it finishes.
+    """
+    def __init__(self, job: Job, store, save_interval=1.0):
+        self.job = job
+        self.store = store
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._last_saved = 0.0
+
+    def __call__(self, counter: str, amount=1):
+        with self._lock:
+            self.job.progress[counter] = self.job.progress.get(counter, 0) + amount
+            self._maybe_save()
+
+    def set(self, counter: str, value):
+        with self._lock:
+            self.job.progress[counter] = value
+            self._maybe_save()
+
+    def _maybe_save(self):
+        # Caller must hold self._lock
+        now = time.monotonic()
+        if now - self._last_saved >= self.save_interval:
+            self._last_saved = now
+            self.store.save(self.job)
+
+
+class InMemoryJobStore:
+    """
+    Keeps jobs in process memory. Only the newest `max_finished_jobs` finished jobs are retained.
+    """
+    def __init__(self, max_finished_jobs=1000):
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, job: Job):
+        with self._lock:
+            self._jobs[job.id] = job
+            finished = [job_id for job_id, stored in self._jobs.items() if stored.finished]
+            for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+                del self._jobs[job_id]
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def unfinished(self) -> list:
+        return []  # Nothing survives a restart
+
+
+class SQLiteJobStore:
+    """
+    Persists jobs to SQLite so queued and interrupted jobs are resumed after a restart.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = SQLiteConnection(db_path)
+        with self._db.lock:
+            self._db.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+                """
+            )
+            self._db.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+            self._db.conn.commit()
+
+    def save(self, job: Job):
+        with self._db.lock:
+            self._db.conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id, job.kind, json.dumps(job.payload), job.status, json.dumps(job.progress),
+                    json.dumps(job.result) if job.result is not None else None, job.error,
+                    job.created_at, job.started_at, job.finished_at,
+                ),
+            )
+            self._db.conn.commit()
+
+    def get(self, job_id: str):
+        with self._db.lock:
+            row = self._db.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def unfinished(self) -> list:
+        with self._db.lock:
+            rows = self._db.conn.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    @staticmethod
+    def _to_job(row) -> Job:
+        job_id, kind, payload, status, progress, result, error, created_at, started_at, finished_at = row
+        return Job(
+            kind, json.loads(payload), job_id=job_id, status=status, progress=json.loads(progress),
+            result=json.loads(result) if result is not None else None, error=error,
+            created_at=created_at, started_at=started_at, finished_at=finished_at,
+        )
+
+
+class JobQueue:
+    """
+    Bounded pool of worker threads running submitted jobs in the background.
+
+    Handlers are registered per job kind as `handler(payload, progress) -> result`, where
+    `progress` is a JobProgress and the result must be JSON-serializable.
+    """
+    def __init__(self, handlers: dict, store=None, max_workers=2, max_pending=100, logger=None):
+        self.handlers = dict(handlers)
+        self.store = store or InMemoryJobStore()
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.logger = logger or get_logger(__name__)
+
+        self._queue = queue.Queue()
+        self._workers = []
+        self._start_lock = threading.Lock()
+
+    def start(self, resume=True):
+        """
+        Start the worker threads and re-enqueue jobs left unfinished by a previous process.
+        Safe to call more than once.
+
+        Args:
+            resume (bool): Re-enqueue unfinished jobs. When several processes share one store,
+                only one of them should resume.
+        """
+        with self._start_lock:
+            if self._workers:
+                return
+            for job in self.store.unfinished() if resume else []:
+                self.logger.info(f"Resuming {job.status} job {job.id} ({job.kind})")
+                job.status = QUEUED
+                self.store.save(job)
+                self._queue.put(job)
+            for i in range(self.max_workers):
+                worker = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+
+    def submit(self, kind: str, payload: dict) -> Job:
+        """
+        Queue a job and return it immediately.
+
+        Raises:
+            ValueError: If no handler is registered for `kind`.
+            JobQueueFull: If `max_pending` jobs are already waiting.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        if self._queue.qsize() >= self.max_pending:
+            raise JobQueueFull(f"Job queue is full ({self.max_pending} pending jobs)")
+        self.start()
+
+        job = Job(kind, payload)
+        self.store.save(job)
+        self._queue.put(job)
+        self.logger.info(f"Queued job {job.id} ({kind})")
+        return job
+
+    def get(self, job_id: str):
+        return self.store.get(job_id)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Job):
+        job.status = RUNNING
+        job.started_at = time.time()
+        self.store.save(job)
+        self.logger.info(f"Running job {job.id} ({job.kind})")
+        try:
+            job.result = self.handlers[job.kind](job.payload, JobProgress(job, self.store))
+            job.status = SUCCEEDED
+        except Exception as e:
+            self.logger.error(f"Job {job.id} ({job.kind}) failed: {str(e)}", exc_info=True)
+            job.status = FAILED
+            job.error = str(e)
+        job.finished_at = time.time()
+        self.store.save(job)
+        self.logger.info(f"Job {job.id} finished with status {job.status}")
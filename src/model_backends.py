@@ -0,0 +1,223 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from logger_config import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+# "torch": full-precision PyTorch. "int8": PyTorch with dynamic int8 quantization of every
+# Linear layer. "onnx": ONNX Runtime (needs the optional `onnxruntime` and `optimum` packages).
+# ONNX Runtime sessions start their thread pools when created and those threads do not
+# survive fork(), so the preforking server (serve.py) should use "torch" or "int8".
+INFERENCE_BACKENDS = ("torch", "int8", "onnx")
+
+# Exported ONNX models are kept here so the export runs once per model
+ONNX_CACHE_DIR = os.path.join(os.getcwd(), "cache", "onnx")
+
+# Fixed evaluation set for parity checks: search terms for the classifier and
+# (search term, product text) pairs for the relevance model
+EVAL_TERMS = [
+    "iphone 15 pro max", "samsung galaxy s24", "dell xps 13 laptop", "ipad air", "sony 65 inch tv",
+    "canon eos r50 camera", "roomba j7 robot vacuum", "eufy x10 pro omni", "google pixel 9 pro xl",
+    "beelink eq14 mini pc", "lenovo m920q", "french door refrigerator", "countertop microwave",
+    "front load washing machine", "lg dishwasher", "nike running shoes", "men's winter jacket",
+    "leather wallet", "women's sunglasses", "organic green tea", "protein bars", "sparkling water",
+    "basmati rice 10kg", "dark chocolate",
+]
+EVAL_PAIRS = [
+    ("iphone 15 pro max", "Apple iPhone 15 Pro Max 256GB Natural Titanium Unlocked"),
+    ("iphone 15 pro max", "Spigen Tough Armor case for iPhone 15 Pro Max"),
+    ("samsung galaxy s24", "Samsung Galaxy S24 Ultra 512GB Titanium Black Smartphone"),
+    ("samsung galaxy s24", "USB-C fast charging cable 2m braided"),
+    ("dell xps 13 laptop", "Dell XPS 13 9340 Laptop Intel Core Ultra 7 16GB RAM 512GB SSD"),
+    ("dell xps 13 laptop", "Laptop sleeve 13 inch water resistant"),
+    ("sony 65 inch tv", "Sony BRAVIA 65\" 4K UHD HDR LED Smart Google TV"),
+    ("sony 65 inch tv", "Universal TV wall mount for 32-70 inch TVs"),
+    ("roomba j7 robot vacuum", "iRobot Roomba j7+ Self-Emptying Robot Vacuum"),
+    ("roomba j7 robot vacuum", "Replacement brushes and filters for Roomba i7 j7"),
+    ("canon eos r50 camera", "Canon EOS R50 Mirrorless Camera with RF-S 18-45mm Lens"),
+    ("canon eos r50 camera", "Camera bag backpack for DSLR and mirrorless"),
+    ("beelink eq14 mini pc", "Beelink EQ14 Mini PC Intel N150 16GB DDR4 500GB SSD"),
+    ("google pixel 9 pro xl", "Google Pixel 9 Pro XL 256GB Obsidian Unlocked"),
+    ("google pixel 9 pro xl", "Tempered glass screen protector for Pixel 9 Pro XL"),
+    ("french door refrigerator", "LG 36\" French Door Refrigerator 26 cu. ft. Stainless Steel"),
+    ("countertop microwave", "Panasonic 1.2 cu. ft. Countertop Microwave 1200W"),
+    ("nike running shoes", "Nike Pegasus 41 Men's Road Running Shoes"),
+    ("organic green tea", "Twinings Organic Pure Green Tea 100 bags"),
+    ("dark chocolate", "Lindt Excellence 85% Cocoa Dark Chocolate Bar"),
+]
+
+
+def load_sentence_transformer(model_name: str, backend="torch"):
+    """
+    Load a SentenceTransformer on the given inference backend.
+
+    Args:
+        model_name (str): Hugging Face model name.
+        backend (str): One of `INFERENCE_BACKENDS`.
+
+    Returns:
+        SentenceTransformer: A model exposing the usual `encode` API.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    if backend == "int8":
+        return _quantize(SentenceTransformer(model_name))
+    if backend == "onnx":
+        # Native ONNX Runtime support in sentence-transformers (>= 3.2); it exports the model
+        # on first load when the hub repository has no ONNX weights
+        return SentenceTransformer(model_name, backend="onnx")
+    raise ValueError(f"Unknown inference backend '{backend}'. Expected one of {INFERENCE_BACKENDS}")
+
+
+def load_zero_shot_pipeline(model_name: str, backend="torch"):
+    """
+    Build a zero-shot-classification pipeline on the given inference backend.
+
+    Args:
+        model_name (str): Hugging Face NLI model name.
+        backend (str): One of `INFERENCE_BACKENDS`.
+
+    Returns:
+        transformers.Pipeline: The zero-shot pipeline.
+    """
+    from transformers import pipeline
+
+    if backend == "torch":
+        return pipeline("zero-shot-classification", model=model_name)
+    if backend == "int8":
+        classifier = pipeline("zero-shot-classification", model=model_name)
+        classifier.model = _quantize(classifier.model)
+        return classifier
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSequenceClassification  # Optional dependency
+        from transformers import AutoTokenizer
+
+        export_dir = os.path.join(ONNX_CACHE_DIR, model_name.replace("/", "--"))
+        if os.path.isdir(export_dir):
+            model = ORTModelForSequenceClassification.from_pretrained(export_dir)
+        else:
+            logger.info(f"Exporting '{model_name}' to ONNX in {export_dir}")
+            model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+            model.save_pretrained(export_dir)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        return pipeline("zero-shot-classification", model=model, tokenizer=tokenizer)
+    raise ValueError(f"Unknown inference backend '{backend}'. Expected one of {INFERENCE_BACKENDS}")
+
+
+def _quantize(model):
+    """
+    Apply dynamic int8 quantization to every Linear layer of a PyTorch model, in place.
+    """
+    import torch
+
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def classifier_parity(candidate_backend: str, terms=None, reference_backend="torch", batch_size=16) -> dict:
+    """
+    Compare the zero-shot classifier on two backends over a fixed set of terms.
+
+    Args:
+        candidate_backend (str): Backend under test.
+        terms (list): Evaluation terms. Defaults to `EVAL_TERMS`.
+        reference_backend (str): Backend treated as ground truth.
+        batch_size (int): Terms per forward pass.
+
+    Returns:
+        dict: Top-label agreement rate, the largest absolute score difference, per-backend
+        timings, and the terms whose top label differs.
+    """
+    from category_classifier import CategoryClassifier
+
+    terms = terms or EVAL_TERMS
+    outputs = {}
+    timings = {}
+    for backend in (reference_backend, candidate_backend):
+        classifier = CategoryClassifier(inference_backend=backend)
+        classifier.zero_shot_model.get()  # Keep loading out of the timing
+        start = time.perf_counter()
+        outputs[backend] = classifier._zero_shot_predict(terms, batch_size)
+        timings[backend] = time.perf_counter() - start
+
+    reference, candidate = outputs[reference_backend], outputs[candidate_backend]
+    disagreements = [
+        {"search_term": term, reference_backend: ref["label"], candidate_backend: cand["label"]}
+        for term, ref, cand in zip(terms, reference, candidate)
+        if ref["label"] != cand["label"]
+    ]
+    score_drift = max(
+        abs(ref["scores"][label] - cand["scores"].get(label, 0.0))
+        for ref, cand in zip(reference, candidate)
+        for label in ref["scores"]
+    )
+    return {
+        "terms": len(terms),
+        "top_label_agreement": (len(terms) - len(disagreements)) / len(terms),
+        "max_score_drift": score_drift,
+        "seconds": timings,
+        "disagreements": disagreements,
+    }
+
+
+def relevance_parity(candidate_backend: str, pairs=None, reference_backend="torch", threshold=0.55) -> dict:
+    """
+    Compare the relevance model's cosine similarities on two backends over fixed pairs.
+
+    Args:
+        candidate_backend (str): Backend under test.
+        pairs (list): (search term, product text) pairs. Defaults to `EVAL_PAIRS`.
+        reference_backend (str): Backend treated as ground truth.
+        threshold (float): Relevance threshold; reports how often the keep/drop decision flips.
+
+    Returns:
+        dict: Mean and max absolute similarity drift, the share of pairs whose threshold
+        decision changes, and per-backend timings.
+    """
+    from scraper_manager import RelevanceChecker
+
+    pairs = pairs or EVAL_PAIRS
+    queries = [query for query, _ in pairs]
+    texts = [text for _, text in pairs]
+    similarities = {}
+    timings = {}
+    for backend in (reference_backend, candidate_backend):
+        model = load_sentence_transformer(RelevanceChecker.MODEL_NAME, backend)
+        start = time.perf_counter()
+        query_embeddings = model.encode(queries, normalize_embeddings=True, convert_to_numpy=True)
+        text_embeddings = model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        timings[backend] = time.perf_counter() - start
+        similarities[backend] = np.sum(query_embeddings * text_embeddings, axis=1)
+
+    drift = np.abs(similarities[reference_backend] - similarities[candidate_backend])
+    flips = (similarities[reference_backend] > threshold) != (similarities[candidate_backend] > threshold)
+    return {
+        "pairs": len(pairs),
+        "mean_similarity_drift": float(drift.mean()),
+        "max_similarity_drift": float(drift.max()),
+        "decision_flip_rate": float(flips.mean()),
+        "seconds": timings,
+    }
+
+
+if __name__ == "__main__":
+    import json
+
+    parser = argparse.ArgumentParser(description="Check a quantized or ONNX backend against full-precision torch.")
+    parser.add_argument("--backend", required=True, choices=[b for b in INFERENCE_BACKENDS if b != "torch"])
+    parser.add_argument("--model", choices=["classifier", "relevance", "both"], default="both")
+    args = parser.parse_args()
+
+    report = {}
+    if args.model in ("classifier", "both"):
+        report["classifier"] = classifier_parity(args.backend)
+    if args.model in ("relevance", "both"):
+        report["relevance"] = relevance_parity(args.backend)
+    print(json.dumps(report, indent=2))
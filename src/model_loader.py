@@ -0,0 +1,96 @@
+import threading
+import time
+
+from logger_config import get_logger
+
+
+class LazyModel:
+    """
+    Defers loading a model until it is first used, and records how long the load took.
+
+    Loading is guarded by a lock so concurrent first callers share a single load.
+    """
+    def __init__(self, name: str, factory, logger=None):
+        self.name = name
+        self._factory = factory
+        self._model = None
+        self._lock = threading.Lock()
+        self.loading = False
+        self.load_seconds = None
+        self.error = None
+        self.logger = logger or get_logger(__name__)
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self):
+        """
+        Return the model, loading it on first call.
+
+        Returns:
+            The loaded model object.
+        """
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self.loading = True
+                    self.logger.info(f"Loading model '{self.name}'")
+                    start = time.perf_counter()
+                    try:
+                        self._model = self._factory()
+                        self.error = None
+                    except Exception as e:
+                        self.error = str(e)
+                        self.logger.error(f"Failed to load model '{self.name}': {e}", exc_info=True)
+                        raise
+                    finally:
+                        self.loading = False
+                    self.load_seconds = time.perf_counter() - start
+                    self.logger.info(f"Loaded model '{self.name}' in {self.load_seconds:.2f}s")
+        return self._model
+
+    def status(self) -> dict:
+        """
+        Report whether the model is loaded and how long loading took.
+
+        Returns:
+            dict: Name, loaded/loading flags, load time in seconds and last load error.
+        """
+        return {
+            "name": self.name,
+            "loaded": self.loaded,
+            "loading": self.loading,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
+
+
+def warm_up(models, background=True, logger=None):
+    """
+    Load several lazy models, optionally on a background daemon thread.
+
+    Args:
+        models (list): LazyModel instances to load.
+        background (bool): Load on a daemon thread and return immediately if True.
+        logger (logging.Logger): Logger for load failures.
+
+    Returns:
+        threading.Thread or None: The warm-up thread when running in the background.
+    """
+    logger = logger or get_logger(__name__)
+
+    def _load_all():
+        for model in models:
+            try:
+                model.get()
+            except Exception:
+                logger.error(f"Warm-up of model '{model.name}' failed; it will be retried on first use")
+
+    if not background:
+        _load_all()
+        return None
+
+    thread = threading.Thread(target=_load_all, name="model-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,306 @@
+import hashlib
+import re
+import sqlite3
+import time
+from urllib.parse import unquote, urlparse
+
+from fork_utils import SQLiteConnection
+from logger_config import get_logger
+from text_utils import normalize_search_term
+
+# Product identifiers embedded in result URLs, per retailer
+PRODUCT_ID_PATTERNS = {
+    "amazon": re.compile(r"/(?:dp|gp/product|gp/aw/d)/([A-Z0-9]{10})(?:[/?&#]|$)"),
+    "bestbuy": re.compile(r"/product/(?:[^/?#]+/)?(\d{5,})(?:[/?&#]|$)"),
+}
+
+_PRICE_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+# Fields whose change makes a product worth re-scoring in incremental mode
+CONTENT_FIELDS = ("Name", "Description", "Price", "Rating")
+
+
+def parse_product_id(url: str):
+    """
+    Extract the retailer and its product id (Amazon ASIN, BestBuy SKU) from a result URL.
+
+    Args:
+        url (str): Product URL as returned by a scraper.
+
+    Returns:
+        tuple: (retailer, product_id), or (None, None) if the URL is not recognized.
+    """
+    if not url or not isinstance(url, str):
+        return None, None
+    host = urlparse(url).netloc.lower()
+    # Sponsored Amazon links wrap the product path in an encoded query parameter
+    path = unquote(url)
+    for retailer, pattern in PRODUCT_ID_PATTERNS.items():
+        if retailer in host:
+            match = pattern.search(path)
+            if match:
+                return retailer, match.group(1)
+    return None, None
+
+
+def parse_number(value):
+    """
+    Parse a price or rating such as "1,299.99", "$49.00" or 4.5 into a float.
+
+    Returns:
+        float or None: None for missing values like "N/A".
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    match = _PRICE_PATTERN.search(value.replace(",", ""))
+    return float(match.group()) if match else None
+
+
+def content_hash(result: dict) -> str:
+    """
+    Hash the content fields of a result, so unchanged products can be recognized across runs.
+    """
+    content = "\x1f".join(str(result.get(field, "")) for field in CONTENT_FIELDS)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class ProductStore:
+    """
+    SQLite store where scraped products accumulate across runs.
+
+    Products are keyed by retailer and the product id parsed from their URL, so the same
+    ASIN or SKU is stored once however many searches return it. Each search term is linked
+    to the products it returned, and a new price/rating observation is recorded whenever
+    either value changes. For incremental scrapes, the last snapshot of every product a term
+    returned (relevant or not) is kept with its content hash and relevance verdict.
+    """
+    def __init__(self, db_path: str, logger=None):
+        self.db_path = db_path
+        self.logger = logger or get_logger(__name__)
+        self._db = SQLiteConnection(db_path)
+        with self._db.lock:
+            self._db.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS products (
+                    retailer TEXT NOT NULL,
+                    product_id TEXT NOT NULL,
+                    name TEXT,
+                    description TEXT,
+                    url TEXT,
+                    price REAL,
+                    rating REAL,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    PRIMARY KEY (retailer, product_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_products_price ON products (price);
+                CREATE INDEX IF NOT EXISTS idx_products_retailer_price ON products (retailer, price);
+
+                CREATE TABLE IF NOT EXISTS observations (
+                    retailer TEXT NOT NULL,
+                    product_id TEXT NOT NULL,
+                    observed_at REAL NOT NULL,
+                    price REAL,
+                    rating REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_observations_product
+                    ON observations (retailer, product_id, observed_at);
+
+                CREATE TABLE IF NOT EXISTS product_terms (
+                    term TEXT NOT NULL,
+                    retailer TEXT NOT NULL,
+                    product_id TEXT NOT NULL,
+                    last_seen REAL NOT NULL,
+                    PRIMARY KEY (term, retailer, product_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_product_terms_product ON product_terms (retailer, product_id);
+
+                CREATE TABLE IF NOT EXISTS term_snapshots (
+                    term TEXT NOT NULL,
+                    retailer TEXT NOT NULL,
+                    product_id TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    relevant INTEGER NOT NULL,
+                    name TEXT,
+                    url TEXT,
+                    price REAL,
+                    captured_at REAL NOT NULL,
+                    PRIMARY KEY (term, retailer, product_id)
+                );
+                """
+            )
+            self._db.conn.commit()
+
+    def upsert_results(self, search_term: str, results: list, observed_at=None) -> int:
+        """
+        Insert or update the products in `results` and link them to `search_term`.
+
+        Results whose URL has no recognizable product id are skipped.
+
+        Args:
+            search_term (str): The term the results were found for.
+            results (list): Result dicts as produced by the scrapers.
+            observed_at (float): Observation timestamp. Defaults to now.
+
+        Returns:
+            int: Number of products stored.
+        """
+        observed_at = observed_at or time.time()
+        term = normalize_search_term(search_term)
+        rows = {}
+        for result in results:
+            retailer, product_id = parse_product_id(result.get("URL"))
+            if product_id:
+                rows[(retailer, product_id)] = (
+                    result.get("Name"), result.get("Description"), result.get("URL"),
+                    parse_number(result.get("Price")), parse_number(result.get("Rating")),
+                )
+
+        with self._db.lock:
+            try:
+                for (retailer, product_id), (name, description, url, price, rating) in rows.items():
+                    current = self._db.conn.execute(
+                        "SELECT price, rating FROM products WHERE retailer = ? AND product_id = ?",
+                        (retailer, product_id),
+                    ).fetchone()
+                    self._db.conn.execute(
+                        """
+                        INSERT INTO products (retailer, product_id, name, description, url, price, rating, first_seen, last_seen)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (retailer, product_id) DO UPDATE SET
+                            name = excluded.name,
+                            description = COALESCE(excluded.description, products.description),
+                            url = excluded.url,
+                            price = excluded.price,
+                            rating = excluded.rating,
+                            last_seen = excluded.last_seen
+                        """,
+                        (retailer, product_id, name, description, url, price, rating, observed_at, observed_at),
+                    )
+                    if current is None or current != (price, rating):
+                        self._db.conn.execute(
+                            "INSERT INTO observations (retailer, product_id, observed_at, price, rating) VALUES (?, ?, ?, ?, ?)",
+                            (retailer, product_id, observed_at, price, rating),
+                        )
+                    self._db.conn.execute(
+                        "INSERT OR REPLACE INTO product_terms (term, retailer, product_id, last_seen) VALUES (?, ?, ?, ?)",
+                        (term, retailer, product_id, observed_at),
+                    )
+                self._db.conn.commit()
+            except sqlite3.Error:
+                self._db.conn.rollback()
+                raise
+
+        self.logger.info(f"Stored {len(rows)} products for '{search_term}' ({len(results) - len(rows)} without a product id)")
+        return len(rows)
+
+    def search(self, search_term=None, retailer=None, min_price=None, max_price=None, limit=100) -> list:
+        """
+        Look up stored products, cheapest first.
+
+        Args:
+            search_term (str): Only products previously returned for this term.
+            retailer (str): Only products from this retailer.
+            min_price (float): Inclusive lower price bound.
+            max_price (float): Inclusive upper price bound.
+            limit (int): Maximum number of products returned.
+
+        Returns:
+            list: Result dicts with the scraper columns plus "Retailer", "Product ID" and "Last Seen".
+        """
+        query = "SELECT p.retailer, p.product_id, p.name, p.description, p.url, p.price, p.rating, p.last_seen FROM products p"
+        clauses = []
+        params = []
+        if search_term:
+            query += " JOIN product_terms t ON t.retailer = p.retailer AND t.product_id = p.product_id"
+            clauses.append("t.term = ?")
+            params.append(normalize_search_term(search_term))
+        if retailer:
+            clauses.append("p.retailer = ?")
+            params.append(retailer)
+        if min_price is not None:
+            clauses.append("p.price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            clauses.append("p.price <= ?")
+            params.append(max_price)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY p.price IS NULL, p.price LIMIT ?"
+        params.append(limit)
+
+        with self._db.lock:
+            rows = self._db.conn.execute(query, params).fetchall()
+        return [
+            {
+                "Retailer": retailer, "Product ID": product_id, "Name": name, "Description": description,
+                "Price": price, "URL": url, "Rating": rating, "Last Seen": last_seen,
+            }
+            for retailer, product_id, name, description, url, price, rating, last_seen in rows
+        ]
+
+    def price_history(self, retailer: str, product_id: str) -> list:
+        """
+        Return the recorded price/rating changes for one product, oldest first.
+        """
+        with self._db.lock:
+            rows = self._db.conn.execute(
+                "SELECT observed_at, price, rating FROM observations "
+                "WHERE retailer = ? AND product_id = ? ORDER BY observed_at",
+                (retailer, product_id),
+            ).fetchall()
+        return [{"observed_at": observed_at, "price": price, "rating": rating} for observed_at, price, rating in rows]
+
+    def load_snapshot(self, search_term: str) -> dict:
+        """
+        Return the last snapshot stored for a term.
+
+        Returns:
+            dict: (retailer, product_id) -> {"hash", "relevant", "name", "url", "price"}.
+        """
+        with self._db.lock:
+            rows = self._db.conn.execute(
+                "SELECT retailer, product_id, content_hash, relevant, name, url, price FROM term_snapshots WHERE term = ?",
+                (normalize_search_term(search_term),),
+            ).fetchall()
+        return {
+            (retailer, product_id): {"hash": digest, "relevant": bool(relevant), "name": name, "url": url, "price": price}
+            for retailer, product_id, digest, relevant, name, url, price in rows
+        }
+
+    def save_snapshot(self, search_term: str, snapshot: dict, captured_at=None):
+        """
+        Replace the stored snapshot for a term.
+
+        Args:
+            search_term (str): The term the snapshot belongs to.
+            snapshot (dict): Same shape as returned by `load_snapshot`.
+            captured_at (float): Snapshot timestamp. Defaults to now.
+        """
+        captured_at = captured_at or time.time()
+        term = normalize_search_term(search_term)
+        with self._db.lock:
+            try:
+                self._db.conn.execute("DELETE FROM term_snapshots WHERE term = ?", (term,))
+                self._db.conn.executemany(
+                    "INSERT INTO term_snapshots (term, retailer, product_id, content_hash, relevant, name, url, price, captured_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (term, retailer, product_id, entry["hash"], int(entry["relevant"]),
+                         entry["name"], entry["url"], entry["price"], captured_at)
+                        for (retailer, product_id), entry in snapshot.items()
+                    ],
+                )
+                self._db.conn.commit()
+            except sqlite3.Error:
+                self._db.conn.rollback()
+                raise
+
+    def stats(self) -> dict:
+        with self._db.lock:
+            products = self._db.conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+            observations = self._db.conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+            terms = self._db.conn.execute("SELECT COUNT(DISTINCT term) FROM product_terms").fetchone()[0]
+        return {"products": products, "observations": observations, "terms": terms}
@@ -0,0 +1,294 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fork_utils import SQLiteConnection
+from logger_config import get_logger
+from text_utils import normalize_search_term
+from ttl_cache import TTLCache
+
+
+class InMemoryBackend:
+    """
+    In-process LRU backend. Entries are dropped once their hard expiry passes.
+    """
+    def __init__(self, maxsize=1024):
+        self._cache = TTLCache(maxsize=maxsize)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, value: dict, ttl: float):
+        self._cache.set(key, value, ttl=ttl)
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+
+class SQLiteBackend:
+    """
+    On-disk backend that survives restarts. Values are stored as JSON.
+    """
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = SQLiteConnection(db_path)
+        with self._db.lock:
+            self._db.conn.execute(
+                "CREATE TABLE IF NOT EXISTS result_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.conn.execute("CREATE INDEX IF NOT EXISTS idx_result_cache_expires_at ON result_cache (expires_at)")
+            self._db.conn.commit()
+
+    def get(self, key):
+        with self._db.lock:
+            row = self._db.conn.execute(
+                "SELECT value FROM result_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value: dict, ttl: float):
+        with self._db.lock:
+            now = time.time()
+            self._db.conn.execute(
+                "INSERT OR REPLACE INTO result_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), now + ttl),
+            )
+            self._db.conn.execute("DELETE FROM result_cache WHERE expires_at <= ?", (now,))
+            self._db.conn.commit()
+
+    def delete(self, key):
+        with self._db.lock:
+            self._db.conn.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+            self._db.conn.commit()
+
+
+class RedisBackend:
+    """
+    Backend for any client exposing the Redis `get`, `set(..., ex=...)` and `delete` commands,
+    e.g. `redis.Redis` or `InProcessRedis`.
+    """
+    def __init__(self, client, prefix="beepcheck:results:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        return json.loads(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
+
+    def set(self, key, value: dict, ttl: float):
+        self.client.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+
+class InProcessRedis:
+    """
+    Minimal in-process stand-in for a Redis client (get/set with `ex`/delete), for local
+    development and tests without a Redis server.
+    """
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[name]
+                return None
+            return value
+
+    def set(self, name, value, ex=None):
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        with self._lock:
+            self._data[name] = (value, time.time() + ex if ex else None)
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+
+class ResultCache:
+    """
+    Caches filtered search results per normalized search term and category.
+
+    Entries are fresh for a TTL that depends on the retailers involved (the shortest TTL
+    wins). After that they stay servable for `stale_ttl` more seconds: a stale hit is
+    returned immediately while a background refresh replaces it (stale-while-revalidate).
+
+    Partial results, where a retailer failed or missed its deadline, are only fresh for
+    `partial_ttl`, so the next request soon retries the missing retailer.
+    """
+    def __init__(self, backend=None, default_ttl=60 * 60, retailer_ttls=None, stale_ttl=6 * 60 * 60,
+                 partial_ttl=5 * 60, logger=None):
+        self.backend = backend or InMemoryBackend()
+        self.default_ttl = default_ttl
+        self.retailer_ttls = dict(retailer_ttls or {})  # retailer -> fresh TTL in seconds
+        self.stale_ttl = stale_ttl
+        self.partial_ttl = partial_ttl
+        self.logger = logger or get_logger(__name__)
+
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    @staticmethod
+    def make_key(search_term: str, category: str) -> str:
+        return f"{category}|{normalize_search_term(search_term)}"
+
+    def ttl_for(self, retailers) -> float:
+        """
+        Return the fresh TTL for results combining the given retailers.
+        """
+        ttls = [self.retailer_ttls.get(retailer, self.default_ttl) for retailer in retailers]
+        return min(ttls) if ttls else self.default_ttl
+
+    def get(self, key: str, refresh=None, ttl=None):
+        """
+        Return cached results for `key` without fetching on a miss.
+
+        Args:
+            key (str): Cache key from `make_key`.
+            refresh (callable): Zero-argument function returning `(results, partial)`, used to
+                refresh a stale entry in the background.
+            ttl (float): Fresh TTL for a refreshed entry. Defaults to `default_ttl`.
+
+        Returns:
+            list or None: Fresh or stale results, or None on a miss.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        entry = self._get_entry(key)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        if time.time() < entry["fresh_until"]:
+            with self._lock:
+                self.hits += 1
+        else:
+            with self._lock:
+                self.stale_hits += 1
+            if refresh is not None:
+                self._refresh_in_background(key, refresh, ttl)
+        return list(entry["results"])
+
+    def get_or_fetch(self, key: str, fetch, ttl=None) -> list:
+        """
+        Return cached results for `key`, calling `fetch()` on a miss.
+
+        Args:
+            key (str): Cache key from `make_key`.
+            fetch (callable): Zero-argument function returning `(results, partial)`, where
+                `partial` is true if a retailer failed or missed its deadline.
+            ttl (float): Fresh TTL for a newly stored entry. Defaults to `default_ttl`.
+
+        Returns:
+            list: The cached or freshly fetched results.
+        """
+        results = self.get(key, refresh=fetch, ttl=ttl)
+        if results is None:
+            results, partial = fetch()
+            self.put(key, results, ttl, partial=partial)
+        return results
+
+    def put(self, key: str, results: list, ttl=None, partial=False):
+        """
+        Store results under `key`. Empty result lists are not cached, since they usually
+        mean a retailer failed or timed out; `partial` results are fresh for at most `partial_ttl`.
+        """
+        if not results:
+            return
+        ttl = self.default_ttl if ttl is None else ttl
+        if partial:
+            ttl = min(ttl, self.partial_ttl)
+        now = time.time()
+        entry = {"results": results, "stored_at": now, "fresh_until": now + ttl}
+        try:
+            self.backend.set(key, entry, ttl + self.stale_ttl)
+        except Exception as e:
+            self.logger.error(f"Failed to store cached results for '{key}': {e}", exc_info=True)
+
+    def invalidate(self, key: str):
+        self.backend.delete(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "backend": self.backend.__class__.__name__,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            }
+
+    def _get_entry(self, key):
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            self.logger.error(f"Failed to read cached results for '{key}': {e}", exc_info=True)
+            return None
+
+    def _refresh_in_background(self, key, fetch, ttl):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self.refreshes += 1
+
+        def _refresh():
+            try:
+                self.logger.info(f"Refreshing stale cached results for '{key}'")
+                results, partial = fetch()
+                self.put(key, results, ttl, partial=partial)
+            except Exception as e:
+                self.logger.error(f"Background refresh failed for '{key}': {e}", exc_info=True)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_executor.submit(_refresh)
+
+
+def create_result_cache(backend="memory", cache_dir=None, redis_url=None, **kwargs):
+    """
+    Build a ResultCache from a backend name.
+
+    Args:
+        backend (str): "memory", "sqlite", "redis", "inprocess-redis" or "none".
+        cache_dir (str): Directory for the SQLite database.
+        redis_url (str): Connection URL for the "redis" backend (requires the `redis` package).
+        **kwargs: Passed to ResultCache.
+
+    Returns:
+        ResultCache or None: None when caching is disabled.
+    """
+    if backend == "none":
+        return None
+    if backend == "memory":
+        store = InMemoryBackend()
+    elif backend == "sqlite":
+        store = SQLiteBackend(os.path.join(cache_dir or os.path.join(os.getcwd(), "cache"), "results.sqlite3"))
+    elif backend == "redis":
+        import redis  # Optional dependency, only needed for a real Redis server
+        store = RedisBackend(redis.Redis.from_url(redis_url or "redis://localhost:6379/0"))
+    elif backend == "inprocess-redis":
+        store = RedisBackend(InProcessRedis())
+    else:
+        raise ValueError(f"Unknown result cache backend '{backend}'")
+    return ResultCache(backend=store, **kwargs)
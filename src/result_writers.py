@@ -0,0 +1,242 @@
+import csv
+import glob
+import gzip
+import importlib.util
+import json
+import os
+
+from logger_config import get_logger
+from product_store import parse_number
+
+# Initialize logger
+logger = get_logger(__name__)
+
+# Column order for tabular outputs; extra keys are dropped, missing ones left blank
+RESULT_COLUMNS = ["Search Term", "Category", "Name", "Description", "Price", "URL", "Rating"]
+
+# Columns stored as numbers in Parquet output; all others are stored as strings
+NUMERIC_COLUMNS = ("Price", "Rating")
+
+
+def _parquet_frame(rows: list, columns=None):
+    """
+    Build a DataFrame with a stable Parquet schema: numeric columns parsed to float and
+    the rest as nullable strings, so missing values stay null instead of becoming "nan".
+    """
+    import pandas as pd
+    df = pd.DataFrame(rows)
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    for column in df.columns:
+        if column in NUMERIC_COLUMNS:
+            df[column] = df[column].map(parse_number).astype("float64")
+        else:
+            df[column] = df[column].astype("string")
+    return df
+
+
+class JsonlWriter:
+    """
+    Appends results as one JSON object per line, flushing after every batch.
+    """
+    extension = ".jsonl"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, rows: list):
+        for row in rows:
+            self._file.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class CsvWriter:
+    """
+    Appends results to a CSV file with a fixed header, flushing after every batch.
+    """
+    extension = ".csv"
+
+    def __init__(self, path: str, columns=None):
+        self.path = path
+        self.columns = columns or RESULT_COLUMNS
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = self._open(path)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+        if write_header:
+            self._writer.writeheader()
+
+    @staticmethod
+    def _open(path):
+        return open(path, "a", encoding="utf-8", newline="")
+
+    def write(self, rows: list):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class GzipCsvWriter(CsvWriter):
+    """
+    Appends results to a gzip-compressed CSV file. Each session appends a new gzip member,
+    which standard gzip readers (and `pd.read_csv`) decompress as one continuous file.
+    """
+    extension = ".csv.gz"
+
+    @staticmethod
+    def _open(path):
+        return gzip.open(path, "at", encoding="utf-8", newline="")
+
+
+class ParquetPartWriter:
+    """
+    Writes each batch as its own Parquet file inside a dataset directory.
+
+    A single Parquet file is unreadable until its footer is written, so writing one part
+    per batch (to a temporary name, then renamed) keeps every completed batch readable if
+    the process dies. Read the result with `pd.read_parquet(directory)`.
+    """
+    extension = ".parquet"
+
+    def __init__(self, path: str, columns=None):
+        import pyarrow  # Optional dependency, only needed for Parquet output  # noqa: F401
+        self.path = path
+        self.columns = columns or RESULT_COLUMNS
+        os.makedirs(path, exist_ok=True)
+        self._next_part = len(glob.glob(os.path.join(path, "part-*.parquet")))
+
+    def write(self, rows: list):
+        if not rows:
+            return
+        df = _parquet_frame(rows, self.columns)
+        part_name = f"part-{self._next_part:06d}.parquet"
+        # Dataset readers skip names starting with "." or "_", so a half-written part is never read
+        tmp_path = os.path.join(self.path, f".{part_name}.tmp")
+        df.to_parquet(tmp_path, index=False, engine="pyarrow")
+        os.replace(tmp_path, os.path.join(self.path, part_name))
+        self._next_part += 1
+
+    def close(self):
+        pass
+
+
+INCREMENTAL_WRITERS = {
+    "jsonl": JsonlWriter,
+    "csv": CsvWriter,
+    "csv.gz": GzipCsvWriter,
+    "parquet": ParquetPartWriter,
+}
+
+
+def open_incremental_writer(fmt: str, path: str):
+    """
+    Open an append-only writer for results that arrive in batches.
+
+    Args:
+        fmt (str): One of "jsonl", "csv", "csv.gz" or "parquet".
+        path (str): Output file (or directory, for Parquet).
+
+    Returns:
+        A writer with `write(rows)` and `close()`.
+    """
+    try:
+        writer_class = INCREMENTAL_WRITERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unsupported output format '{fmt}'. Expected one of {sorted(INCREMENTAL_WRITERS)}")
+    logger.info(f"Writing {fmt} results incrementally to {path}")
+    return writer_class(path)
+
+
+def _write_xlsx(results, path):
+    import pandas as pd
+    pd.DataFrame(results).to_excel(path, index=False)
+
+
+def _write_parquet(results, path):
+    _parquet_frame(results).to_parquet(path, index=False, engine="pyarrow")
+
+
+def _write_csv_gz(results, path):
+    columns = list(dict.fromkeys(key for result in results for key in result))
+    # Fast compression level: exports are written once and downloaded soon after
+    with gzip.open(path, "wt", encoding="utf-8", newline="", compresslevel=1) as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def _write_jsonl(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+
+
+# Whole-result writers, keyed by format name; the format name is also the file extension
+RESULT_WRITERS = {
+    "xlsx": _write_xlsx,
+    "parquet": _write_parquet,
+    "csv.gz": _write_csv_gz,
+    "jsonl": _write_jsonl,
+}
+
+# Extensions served by /data_files and /download, for single-result and bulk outputs alike
+RESULT_EXTENSIONS = tuple(sorted({f".{fmt}" for fmt in list(RESULT_WRITERS) + list(INCREMENTAL_WRITERS)}))
+
+# Formats whose writer needs an optional package, keyed by format name
+FORMAT_ENGINES = {
+    "xlsx": "openpyxl",
+    "parquet": "pyarrow",
+}
+
+
+def missing_engine(fmt: str):
+    """
+    Name the package a format needs but that cannot be imported, so callers can reject the
+    format up front instead of failing in a background write.
+
+    Args:
+        fmt (str): Output format name.
+
+    Returns:
+        str or None: The missing package, or None if the format can be written.
+    """
+    engine = FORMAT_ENGINES.get(fmt)
+    if engine is not None and importlib.util.find_spec(engine) is None:
+        return engine
+    return None
+
+
+def write_results(results: list, path: str, fmt: str) -> str:
+    """
+    Write a complete result list in one of the `RESULT_WRITERS` formats.
+
+    The file is written under a temporary name and renamed into place, so a reader never
+    sees a partial file.
+
+    Args:
+        results (list): Result dicts to write.
+        path (str): Output file path.
+        fmt (str): One of "xlsx", "parquet", "csv.gz" or "jsonl".
+
+    Returns:
+        str: The output file path.
+    """
+    try:
+        write = RESULT_WRITERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unsupported output format '{fmt}'. Expected one of {sorted(RESULT_WRITERS)}")
+    # Keep the real extension last on the temp name; pandas picks the Excel engine from it
+    tmp_path = os.path.join(os.path.dirname(path), f".tmp-{os.path.basename(path)}")
+    try:
+        write(results, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    logger.info(f"Wrote {len(results)} results as {fmt} to {path}")
+    return path
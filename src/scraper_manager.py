@@ -1,92 +1,374 @@
 from category_classifier import CategoryClassifier
 from scrapers.amazon_scraper import AmazonScraper
 from scrapers.bestbuy_scraper import BestBuyScraper
-from sentence_transformers import SentenceTransformer, util
+from scrapers.http_client import create_async_client
+from sentence_transformers import util
+import numpy as np
+import torch
 from logger_config import get_logger
-import pandas as pd
+from embedding_cache import EmbeddingCache
+from model_loader import LazyModel, warm_up
+from scraper_pool import ScraperPool
+from single_flight import SingleFlight
+from inference_batcher import MicroBatcher
+from model_backends import INFERENCE_BACKENDS, load_sentence_transformer
+from product_store import content_hash, parse_number, parse_product_id
+from text_utils import lexical_overlap, lexical_tokens, normalize_search_term
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from result_writers import write_results
+import asyncio
 import os
+import re
+import threading
+import time
 
 
 class RelevanceChecker:
     """
     Filters search results based on semantic similarity to the search term.
+
+    Results pass through cheap stages before the embedding model sees them: products
+    containing an exclusion keyword are dropped with one precompiled regex, then, if
+    `min_lexical_score` is set, products whose text covers less than that fraction of the
+    search term's word tokens (see `lexical_overlap`) are dropped as lexical misses. Only the
+    survivors are embedded and scored.
+
+    The lexical stage is off by default. Synonyms and abbreviations share no tokens
+    ("laptop" vs "HP Notebook", "ps5" vs "PlayStation 5 Console"), and catching those is
+    exactly what the semantic stage is for. Enable it only for catalogs where the
+    `lexical_miss` count in `stage_stats` has been checked against what the model would keep.
     """
-    def __init__(self, similarity_threshold=0.55, exclusion_keywords=None, logger=None):
-        self.model = SentenceTransformer('all-MiniLM-L12-v2')
+    MODEL_NAME = 'all-MiniLM-L12-v2'
+
+    def __init__(self, similarity_threshold=0.55, exclusion_keywords=None, logger=None, batch_size=64,
+                 embedding_cache=None, batch_window_ms=None, inference_backend="torch", min_lexical_score=0.0):
+        if inference_backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend '{inference_backend}'. Expected one of {INFERENCE_BACKENDS}")
+        self.inference_backend = inference_backend
+        self.lazy_model = LazyModel(
+            self.model_name(inference_backend),
+            lambda: load_sentence_transformer(self.MODEL_NAME, inference_backend),
+        )
         self.similarity_threshold = similarity_threshold
         self.exclusion_keywords = exclusion_keywords or ["case", "protector", "accessory", "cable", "replacement"]
+        # One pass over the lowercased text finds any keyword as a substring, as `keyword in text` would
+        self.exclusion_pattern = re.compile(
+            "|".join(re.escape(keyword.lower()) for keyword in self.exclusion_keywords if keyword)
+        ) if any(self.exclusion_keywords) else None
+        self.min_lexical_score = min_lexical_score  # Fraction of query tokens required; 0 disables the lexical stage
+        self.batch_size = batch_size  # Maximum number of product texts per encode call
+        self.embedding_cache = embedding_cache  # Optional EmbeddingCache for product texts
         self.logger = logger or get_logger(__name__)  # Default to module logger
+        # With a batch window, encodes from all threads are merged by one inference worker
+        self.encoder = (
+            MicroBatcher("relevance-encode", self._encode_batch, max_batch_size=batch_size,
+                         max_wait_ms=batch_window_ms, logger=self.logger)
+            if batch_window_ms is not None else None
+        )
+
+        # Cumulative per-stage counts, see `stage_stats`
+        self._stage_counts = {"input": 0, "missing_text": 0, "excluded": 0, "lexical_miss": 0, "embedded": 0, "relevant": 0}
+        self._stage_lock = threading.Lock()
+
+    @classmethod
+    def model_name(cls, inference_backend="torch") -> str:
+        """
+        Name of the model as run by `inference_backend`, e.g. "all-MiniLM-L12-v2 (int8)".
+        Backends produce slightly different vectors, so this also keys cached embeddings.
+        """
+        return cls.MODEL_NAME if inference_backend == "torch" else f"{cls.MODEL_NAME} ({inference_backend})"
+
+    @property
+    def model(self):
+        return self.lazy_model.get()
+
+    def _encode_batch(self, texts):
+        # Runs on the inference worker with texts merged from concurrent callers
+        return self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True)
 
-    def filter_relevant_results(self, search_term, results):
+    def stage_stats(self) -> dict:
+        """
+        Report how many results each filter stage has received and removed since startup.
+
+        Returns:
+            dict: Counts of input results, results dropped for missing text, by exclusion
+            keyword and as lexical misses, results embedded and results kept.
+        """
+        with self._stage_lock:
+            stats = dict(self._stage_counts)
+        stats["embedded_fraction"] = stats["embedded"] / stats["input"] if stats["input"] else 0.0
+        return stats
+
+    def _count_stages(self, **counts):
+        with self._stage_lock:
+            for stage, amount in counts.items():
+                self._stage_counts[stage] += amount
+
+    def _encode_query(self, search_term):
+        if self.encoder is None:
+            return self.model.encode(search_term, convert_to_tensor=True)
+        return torch.from_numpy(np.asarray(self.encoder.run([search_term])[0], dtype=np.float32))
+
+    def _encode_texts(self, texts):
+        """
+        Encode product texts, serving repeated texts from the embedding cache when one is configured.
+
+        Args:
+            texts (list): Texts to encode.
+
+        Returns:
+            torch.Tensor: A (len(texts), dim) tensor of embeddings.
+        """
+        if self.embedding_cache is None:
+            return self._encode_uncached(texts)
+
+        embeddings = self.embedding_cache.get_many(texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            encoded = self._encode_uncached(missing_texts).cpu().numpy()
+            self.embedding_cache.put_many(missing_texts, encoded)
+            for i, embedding in zip(missing, encoded):
+                embeddings[i] = embedding
+
+        self.logger.debug(f"Embedding cache served {len(texts) - len(missing)} of {len(texts)} product texts")
+        return torch.from_numpy(np.stack(embeddings).astype(np.float32))
+
+    def _encode_uncached(self, texts):
+        """
+        Encode product texts in size-bounded batches.
+
+        Args:
+            texts (list): Texts to encode.
+
+        Returns:
+            torch.Tensor: A (len(texts), dim) tensor of embeddings.
+        """
+        if self.encoder is not None:
+            return torch.from_numpy(np.stack(self.encoder.run(texts)).astype(np.float32))
+
+        embeddings = [
+            self.model.encode(
+                texts[i:i + self.batch_size],
+                batch_size=self.batch_size,
+                convert_to_tensor=True,
+            )
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        return torch.cat(embeddings)
+
+    def filter_relevant_results(self, search_term, results, progress=None):
         """
         Filter results based on semantic similarity of both Name and Description.
 
         Args:
             search_term (str): The search term to compare against.
             results (list): List of product results to filter.
+            progress (callable): Optional `progress(counter, amount)` reporter; receives
+                "items_prefiltered" and "items_scored".
 
         Returns:
             list: Filtered list of relevant results.
         """
-        search_embedding = self.model.encode(search_term, convert_to_tensor=True)
-        relevant_results = []
+        relevant_results = [
+            result
+            for batch in self.iter_relevant_results(search_term, results, progress)
+            for result in batch
+        ]
+        self.logger.info(f"Filtered {len(relevant_results)} relevant results from {len(results)} total.")
+        return relevant_results
+
+    def iter_relevant_results(self, search_term, results, progress=None):
+        """
+        Score results in batches of `batch_size`, yielding the relevant ones from each batch
+        as soon as it has been scored.
+
+        Args:
+            search_term (str): The search term to compare against.
+            results (list): List of product results to filter.
+            progress (callable): Optional `progress(counter, amount)` reporter; receives
+                "items_prefiltered" and "items_scored".
 
+        Yields:
+            list: Relevant results from one batch (possibly empty).
+        """
+        # Empty when the lexical stage is off, or when the query has no word tokens (e.g. only
+        # punctuation), which would otherwise reject every product
+        query_tokens = lexical_tokens(search_term) if self.min_lexical_score else set()
+        candidates = []
+        texts = []
+        missing_text = excluded = lexical_miss = 0
         for result in results:
             # Get Name and Description
             product_name = result.get('Name', '')
             product_description = result.get('Description', '')
 
             if not product_name and not product_description:
+                missing_text += 1
                 continue  # Skip if both Name and Description are missing
 
             # Combine Name and Description into a single text
             combined_text = f"{product_name} {product_description}".strip()
 
-            # Compute semantic similarity
-            product_embedding = self.model.encode(combined_text, convert_to_tensor=True)
-            similarity = util.pytorch_cos_sim(search_embedding, product_embedding).item()
-            self.logger.debug(
-                f"Product: {product_name}, Similarity: {similarity:.4f}, Combined Text: {combined_text}"
-            )
-            # Check for exclusion keywords and filter based on similarity threshold
-            if similarity > self.similarity_threshold and not any(
-                keyword.lower() in combined_text.lower() for keyword in self.exclusion_keywords
-            ):
-                relevant_results.append(result)
+            # Stage 1: exclusion keywords
+            if self.exclusion_pattern is not None and self.exclusion_pattern.search(combined_text.lower()):
+                excluded += 1
+                continue
 
-        self.logger.info(f"Filtered {len(relevant_results)} relevant results from {len(results)} total.")
-        return relevant_results
+            # Stage 2: lexical overlap with the search term
+            if query_tokens and lexical_overlap(query_tokens, combined_text) < self.min_lexical_score:
+                lexical_miss += 1
+                continue
+
+            candidates.append(result)
+            texts.append(combined_text)
+
+        self._count_stages(
+            input=len(results), missing_text=missing_text, excluded=excluded, lexical_miss=lexical_miss,
+            embedded=len(candidates),
+        )
+        self.logger.info(
+            f"Relevance stages for '{search_term}': {len(results)} in, {excluded} excluded by keyword, "
+            f"{lexical_miss} lexical misses, {len(candidates)} to embed"
+        )
+        if progress:
+            progress("items_prefiltered", len(results) - len(candidates))
+        if not candidates:
+            return
+
+        # Stage 3: semantic similarity
+        search_embedding = self._encode_query(search_term)
+        for start in range(0, len(candidates), self.batch_size):
+            batch_candidates = candidates[start:start + self.batch_size]
+            batch_texts = texts[start:start + self.batch_size]
+
+            # Score the whole batch against the search term in one matrix operation
+            product_embeddings = self._encode_texts(batch_texts).to(search_embedding.device)
+            similarities = util.pytorch_cos_sim(search_embedding, product_embeddings)[0].tolist()
+            if progress:
+                progress("items_scored", len(batch_candidates))
+
+            relevant_results = []
+            for result, combined_text, similarity in zip(batch_candidates, batch_texts, similarities):
+                self.logger.debug(
+                    f"Product: {result.get('Name', '')}, Similarity: {similarity:.4f}, Combined Text: {combined_text}"
+                )
+                # Filter based on similarity threshold
+                if similarity > self.similarity_threshold:
+                    relevant_results.append(result)
+            self._count_stages(relevant=len(relevant_results))
+            yield relevant_results
+
+
+class ScrapeFailures:
+    """
+    Records which retailers reported failed pages or failed scrapes during one scrape, so
+    partial results are not cached or treated as complete.
+
+    `for_retailer` wraps the caller's progress reporter for one retailer's scrape.
+    """
+    FAILURE_COUNTERS = ("pages_failed", "scrapers_failed")
+
+    def __init__(self, progress=None):
+        self.progress = progress
+        self.retailers = set()
+
+    def for_retailer(self, retailer: str):
+        def _progress(counter, amount=1):
+            if counter in self.FAILURE_COUNTERS and amount:
+                self.retailers.add(retailer)
+            if self.progress:
+                self.progress(counter, amount)
+        return _progress
 
 
 class ScraperManager:
-    def __init__(self, data_dir=None):
+    def __init__(self, data_dir=None, concurrent=True, max_workers=8, request_timeout=60, scraper_timeout=45,
+                 cache_dir=None, classifier_backend="zero-shot", http_session=None, result_cache=None,
+                 product_store=None, batch_window_ms=None, inference_backend="torch", min_lexical_score=0.0):
+        # All scrapers share one pooled HTTP session (the process-wide one unless given)
         self.scrapers = {
-            "Electronics": [AmazonScraper(), BestBuyScraper()],
-            "Appliances": [BestBuyScraper()],
+            "Electronics": [AmazonScraper(session=http_session), BestBuyScraper(session=http_session)],
+            "Appliances": [BestBuyScraper(session=http_session)],
             "Fashion": [],  # Add scrapers for fashion retailers
             "Groceries": [],  # Add scrapers for grocery retailers
         }
-        self.classifier = CategoryClassifier()
         self.data_dir = data_dir or os.path.join(os.getcwd(), "data")  # Default data directory
         os.makedirs(self.data_dir, exist_ok=True)
 
         # Initialize logger
         self.logger = get_logger(__name__)
 
-        # Initialize RelevanceChecker with logger
-        self.relevance_checker = RelevanceChecker(logger=self.logger)
+        # Persistent caches live outside the data directory so they are not listed as result files
+        self.cache_dir = cache_dir or os.path.join(os.getcwd(), "cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Keyed by backend too, so int8/onnx vectors never mix with torch ones
+        self.embedding_cache = EmbeddingCache(
+            RelevanceChecker.model_name(inference_backend),
+            db_path=os.path.join(self.cache_dir, "embeddings.sqlite3"),
+            logger=self.logger,
+        )
+
+        # Initialize RelevanceChecker with logger. With `batch_window_ms`, inference for all
+        # concurrent requests runs on per-model batching workers instead of request threads.
+        # `min_lexical_score` enables its lexical prefilter (off by default).
+        self.relevance_checker = RelevanceChecker(
+            logger=self.logger, embedding_cache=self.embedding_cache, batch_window_ms=batch_window_ms,
+            inference_backend=inference_backend, min_lexical_score=min_lexical_score,
+        )
+
+        # The embedding classifier backend reuses the MiniLM model already loaded for relevance checks
+        self.classifier = CategoryClassifier(
+            backend=classifier_backend,
+            embedding_model=self.relevance_checker.lazy_model,
+            batch_window_ms=batch_window_ms,
+            inference_backend=inference_backend,
+        )
+
+        # Concurrent fan-out settings. `request_timeout` bounds the whole scrape,
+        # `scraper_timeout` bounds each individual retailer.
+        self.concurrent = concurrent
+        self.request_timeout = request_timeout
+        self.scraper_timeout = scraper_timeout
+        self.pool = ScraperPool(max_workers=max_workers)
+        # Result files are written here so exports never hold up a request
+        self.export_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="export")
 
-    def fetch_data(self, search_term: str) -> list:
+        # Optional ResultCache for filtered results, keyed by normalized term and category
+        self.result_cache = result_cache
+
+        # Optional ProductStore where every scrape's relevant products accumulate
+        self.product_store = product_store
+
+        # Concurrent fetch_data calls for the same normalized term share one scrape
+        self.in_flight = SingleFlight()
+
+    def fetch_data(self, search_term: str, timeout=None, category=None, progress=None, pool=None) -> list:
         """
         Fetch data from the appropriate scrapers based on the search term.
 
         Args:
             search_term (str): The term to search for.
+            timeout (float): Overall deadline in seconds for the scrape. Defaults to `self.request_timeout`.
+            category (str): Precomputed category, e.g. from `classify_batch`. Classified here if omitted.
+            progress (callable): Optional `progress(counter, amount)` reporter for background jobs.
+                Receives "pages_fetched", "pages_failed", "items_fetched", "scrapers_failed",
+                "items_prefiltered" and "items_scored".
+            pool (ScraperPool): Pool to run the scrapers on, e.g. a bulk run's own pool with
+                per-retailer caps. Defaults to `self.pool`.
 
         Returns:
             list: Filtered list of relevant results.
         """
-        category = self.classifier.classify(search_term)
+        key = (normalize_search_term(search_term), category)
+        return list(self.in_flight.do(key, lambda: self._fetch_data(search_term, timeout, category, progress, pool)))
+
+    def _fetch_data(self, search_term: str, timeout=None, category=None, progress=None, pool=None) -> list:
+        """
+        Classify, scrape and filter for one search term. Callers go through `fetch_data`,
+        which coalesces concurrent identical requests.
+        """
+        category = category or self.classifier.classify(search_term)
         selected_scrapers = self.scrapers.get(category, [])
 
         self.logger.info(f"Search term '{search_term}' classified as category: {category}")
@@ -96,40 +378,593 @@ class ScraperManager:
 
         self.logger.debug(f"Selected scrapers: {', '.join(scraper.__class__.__name__ for scraper in selected_scrapers)}")
 
-        results = []
-        for scraper in selected_scrapers:
-            try:
-                self.logger.info(f"Starting scrape for '{search_term}' with {scraper.__class__.__name__}")
-                results.extend(scraper.fetch_results(search_term))
-            except Exception as e:
-                self.logger.error(f"Error while scraping with {scraper.__class__.__name__}: {str(e)}", exc_info=True)
+        if self.result_cache is None:
+            return self._scrape_and_filter(search_term, selected_scrapers, timeout, progress, pool)[0]
+
+        key = self.result_cache.make_key(search_term, category)
+        ttl = self.result_cache.ttl_for(scraper.RETAILER for scraper in selected_scrapers)
+        return self.result_cache.get_or_fetch(
+            key, lambda: self._scrape_and_filter(search_term, selected_scrapers, timeout, progress, pool), ttl
+        )
+
+    def iter_data(self, search_term: str, timeout=None, category=None, progress=None):
+        """
+        Streaming counterpart of `fetch_data`: yields relevant results in batches as each
+        scraper finishes and each relevance batch is scored, instead of waiting for the
+        slowest retailer.
+
+        A cached entry is yielded as a single batch. Streams are not coalesced with
+        concurrent identical calls; the complete result is stored in the result cache.
+
+        Args:
+            search_term (str): The term to search for.
+            timeout (float): Overall deadline in seconds for the scrape. Defaults to `self.request_timeout`.
+            category (str): Precomputed category. Classified here if omitted.
+            progress (callable): Optional progress reporter.
+
+        Yields:
+            list: A non-empty batch of relevant results.
+        """
+        category = category or self.classifier.classify(search_term)
+        selected_scrapers = self.scrapers.get(category, [])
+
+        self.logger.info(f"Search term '{search_term}' classified as category: {category}")
+        if not selected_scrapers:
+            self.logger.info(f"No scrapers configured for category: {category}")
+            return
+
+        key = ttl = None
+        if self.result_cache is not None:
+            key = self.result_cache.make_key(search_term, category)
+            ttl = self.result_cache.ttl_for(scraper.RETAILER for scraper in selected_scrapers)
+            cached = self.result_cache.get(
+                key, refresh=lambda: self._scrape_and_filter(search_term, selected_scrapers, timeout), ttl=ttl
+            )
+            if cached is not None:
+                if cached:
+                    yield cached
+                return
+
+        start = time.monotonic()
+        request_deadline = start + (timeout if timeout is not None else self.request_timeout)
+        scraper_deadline = min(start + self.scraper_timeout, request_deadline)
+        failures = ScrapeFailures(progress)
+        futures = {
+            self.pool.submit(
+                self._run_scraper, scraper, search_term, failures.for_retailer(scraper.RETAILER), scraper_deadline
+            ): scraper
+            for scraper in selected_scrapers
+        }
+
+        all_results = []
+        pending = set(futures)
+        while pending:
+            # Wait only for scrapers; scoring time is not charged to their deadline, so a scraper
+            # that finished while an earlier one was being scored is still picked up
+            done, pending = wait(pending, timeout=max(0, scraper_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                scraper_results = future.result()
+                self.logger.info(f"{futures[future].__class__.__name__} returned {len(scraper_results)} results for '{search_term}'")
+                for batch in self.relevance_checker.iter_relevant_results(search_term, scraper_results, progress):
+                    if batch:
+                        all_results.extend(batch)
+                        yield batch
+
+        for future in pending:
+            future.cancel()  # Only stops a scraper that has not started; a running one stops at its deadline
+            self.logger.warning(
+                f"{futures[future].__class__.__name__} did not finish within its deadline for '{search_term}'. "
+                f"Returning partial results."
+            )
+            failures.for_retailer(futures[future].RETAILER)("scrapers_failed", 1)
+
+        self.logger.info(f"Streamed {len(all_results)} relevant results for '{search_term}'")
+        self._store_products(search_term, all_results)
+        if key is not None:
+            self.result_cache.put(key, all_results, ttl, partial=bool(failures.retailers))
+
+    def _scrape_and_filter(self, search_term: str, selected_scrapers: list, timeout=None, progress=None,
+                           pool=None) -> list:
+        """
+        Run the selected scrapers and filter their combined results for relevance.
+
+        Args:
+            search_term (str): The term to search for.
+            selected_scrapers (list): Scrapers to run.
+            timeout (float): Overall deadline in seconds for the scrape.
+            progress (callable): Optional progress reporter.
+            pool (ScraperPool): Pool to run the scrapers on. Defaults to `self.pool`.
+
+        Returns:
+            tuple: Filtered list of relevant results, and whether they are partial because a
+                retailer failed or missed its deadline.
+        """
+        results, failed_retailers = self._scrape(search_term, selected_scrapers, timeout, progress, pool)
+        partial = bool(failed_retailers)
+
+        if results:
+            # Filter results for relevance
+            filtered_results = self.relevance_checker.filter_relevant_results(search_term, results, progress)
+            self.logger.info(f"Results after filtering: {len(filtered_results)}")
+            self._store_products(search_term, filtered_results)
+            return filtered_results, partial
+        else:
+            self.logger.info(f"No results found for search term: '{search_term}'")
+            return [], partial
+
+    def _scrape(self, search_term: str, selected_scrapers: list, timeout=None, progress=None, pool=None) -> tuple:
+        """
+        Run the selected scrapers and return their combined, unfiltered results.
+
+        Returns:
+            tuple: The results, and the set of retailers that reported failed pages, failed
+                outright or missed their deadline.
+        """
+        failures = ScrapeFailures(progress)
+        if self.concurrent and len(selected_scrapers) > 1:
+            results = self._run_scrapers_concurrently(search_term, selected_scrapers, timeout, failures, pool)
+        else:
+            results = []
+            request_deadline = time.monotonic() + (timeout if timeout is not None else self.request_timeout)
+            for scraper in selected_scrapers:
+                scraper_deadline = min(time.monotonic() + self.scraper_timeout, request_deadline)
+                results.extend(self._run_scraper(
+                    scraper, search_term, failures.for_retailer(scraper.RETAILER), scraper_deadline, pool
+                ))
 
         if results:
             self.logger.info(f"Scraping completed for '{search_term}'. Total results fetched: {len(results)}")
+        if failures.retailers:
+            self.logger.warning(f"Partial scrape for '{search_term}': {', '.join(sorted(failures.retailers))} failed")
+        return results, failures.retailers
 
-            # Filter results for relevance
-            filtered_results = self.relevance_checker.filter_relevant_results(search_term, results)
+    def fetch_delta(self, search_term: str, timeout=None, category=None, progress=None) -> dict:
+        """
+        Scrape `search_term` and report what changed since the previous incremental run.
+
+        Fresh results are matched against the term's last snapshot in the product store by
+        retailer product id and content hash. Only new or changed products go through the
+        relevance checker; unchanged ones keep their previous verdict. Previous products of a
+        retailer that returned nothing this time, or that reported failed pages, failed or
+        timed out, are carried over rather than reported as removed, since they may simply
+        not have been fetched. The result cache is bypassed.
+
+        Args:
+            search_term (str): The term to search for.
+            timeout (float): Overall deadline in seconds for the scrape.
+            category (str): Precomputed category. Classified here if omitted.
+            progress (callable): Optional progress reporter; also receives "items_unchanged".
+
+        Returns:
+            dict: "added" and "price_changed" result lists (the latter with "Previous Price"),
+                "removed" products ({"Retailer", "Product ID", "Name", "URL", "Price"}),
+                "unchanged" and "scored" counts, and the full "results" list of relevant products.
+
+        Raises:
+            ValueError: If no product store is configured.
+        """
+        if self.product_store is None:
+            raise ValueError("Incremental scraping requires a product store")
+
+        category = category or self.classifier.classify(search_term)
+        selected_scrapers = self.scrapers.get(category, [])
+        self.logger.info(f"Search term '{search_term}' classified as category: {category}")
+
+        previous = self.product_store.load_snapshot(search_term)
+        results, failed_retailers = self._scrape(search_term, selected_scrapers, timeout, progress)
+
+        snapshot = {}
+        to_score = []
+        unchanged_relevant = []
+        for result in results:
+            key = parse_product_id(result.get("URL"))
+            if key[1] is None:
+                to_score.append((None, result))  # Untrackable, always scored
+                continue
+            digest = content_hash(result)
+            entry = previous.get(key)
+            if entry is not None and entry["hash"] == digest:
+                snapshot[key] = entry
+                if entry["relevant"]:
+                    unchanged_relevant.append(result)
+            else:
+                snapshot[key] = {
+                    "hash": digest, "relevant": False, "name": result.get("Name"),
+                    "url": result.get("URL"), "price": parse_number(result.get("Price")),
+                }
+                to_score.append((key, result))
+        if progress:
+            progress("items_unchanged", len(results) - len(to_score))
+
+        scored_relevant = self.relevance_checker.filter_relevant_results(
+            search_term, [result for _, result in to_score], progress
+        )
+        relevant_ids = {id(result) for result in scored_relevant}
+        for key, result in to_score:
+            if key is not None and id(result) in relevant_ids:
+                snapshot[key]["relevant"] = True
+
+        # Keep the previous entries of retailers that failed or returned nothing this run
+        returned_retailers = {retailer for retailer, _ in snapshot}
+        for key, entry in previous.items():
+            if key[0] in failed_retailers or key[0] not in returned_retailers:
+                snapshot.setdefault(key, entry)
+
+        added = []
+        price_changed = []
+        for key, result in to_score:
+            if id(result) not in relevant_ids:
+                continue
+            entry = previous.get(key) if key is not None else None
+            if entry is None or not entry["relevant"]:
+                added.append(result)
+            elif entry["price"] != snapshot[key]["price"]:
+                price_changed.append(dict(result, **{"Previous Price": entry["price"]}))
+        removed = [
+            {"Retailer": key[0], "Product ID": key[1], "Name": entry["name"], "URL": entry["url"], "Price": entry["price"]}
+            for key, entry in previous.items()
+            if entry["relevant"] and not snapshot.get(key, {}).get("relevant")
+        ]
+
+        self.product_store.save_snapshot(search_term, snapshot)
+        relevant_results = unchanged_relevant + scored_relevant
+        self._store_products(search_term, relevant_results)
+        self.logger.info(
+            f"Delta for '{search_term}': {len(added)} added, {len(removed)} removed, {len(price_changed)} price changes, "
+            f"{len(results) - len(to_score)} unchanged, {len(to_score)} scored"
+        )
+        return {
+            "added": added,
+            "removed": removed,
+            "price_changed": price_changed,
+            "unchanged": len(results) - len(to_score),
+            "scored": len(to_score),
+            "results": relevant_results,
+        }
+
+    def _store_products(self, search_term: str, results: list):
+        """
+        Upsert results into the product store, if one is configured. Failures are logged,
+        never raised, so the store cannot break a scrape.
+        """
+        if self.product_store is None or not results:
+            return
+        try:
+            self.product_store.upsert_results(search_term, results)
+        except Exception as e:
+            self.logger.error(f"Failed to store products for '{search_term}': {str(e)}", exc_info=True)
+
+    def models(self) -> list:
+        """
+        Return the lazily loaded models used by this manager.
+
+        Returns:
+            list: LazyModel instances.
+        """
+        return [self.relevance_checker.lazy_model, self.classifier.zero_shot_model]
+
+    def model_status(self) -> dict:
+        """
+        Report which models are loaded and how long each took to load.
+
+        Returns:
+            dict: {"ready": bool, "models": [LazyModel.status(), ...]}.
+        """
+        statuses = [model.status() for model in self.models()]
+        return {"ready": all(status["loaded"] for status in statuses), "models": statuses}
+
+    def warm_up(self, background=True):
+        """
+        Load all models now instead of on first request.
+
+        Args:
+            background (bool): Load on a daemon thread and return immediately if True.
+
+        Returns:
+            threading.Thread or None: The warm-up thread when running in the background.
+        """
+        return warm_up(self.models(), background=background, logger=self.logger)
+
+    def cache_stats(self) -> dict:
+        """
+        Report hit/miss counters for the caches owned by this manager.
+
+        Returns:
+            dict: Stats keyed by cache name.
+        """
+        return {
+            "embedding_cache": self.embedding_cache.stats(),
+            "classification_cache": self.classifier.cache.stats(),
+            "classifier": {
+                "backend": self.classifier.backend,
+                "embedding_predictions": self.classifier.embedding_predictions,
+                "zero_shot_fallbacks": self.classifier.zero_shot_fallbacks,
+            },
+            "result_cache": self.result_cache.stats() if self.result_cache else None,
+            "single_flight": self.in_flight.stats(),
+            "product_store": self.product_store.stats() if self.product_store else None,
+            "relevance_stages": self.relevance_checker.stage_stats(),
+            "inference_batching": {
+                batcher.name: batcher.stats()
+                for batcher in (self.relevance_checker.encoder, self.classifier.batcher)
+                if batcher is not None
+            },
+        }
+
+    def _run_scraper(self, scraper, search_term: str, progress=None, deadline=None, pool=None) -> list:
+        """
+        Run a single scraper, logging and swallowing any error so one retailer cannot fail the request.
+
+        Args:
+            scraper (Scraper): The scraper to run.
+            search_term (str): The term to search for.
+            progress (callable): Optional progress reporter.
+            deadline (float): Optional `time.monotonic()` time after which the scraper stops
+                retrying and paginating, so an abandoned scrape frees its worker thread.
+            pool (ScraperPool): Pool whose per-retailer cap applies. Defaults to `self.pool`.
+
+        Returns:
+            list: Results from the scraper, or an empty list on error.
+        """
+        pool = pool or self.pool
+        if not pool.acquire(scraper.RETAILER, deadline):
+            self.logger.warning(
+                f"{scraper.__class__.__name__} found no free '{pool.name}' slot before its deadline for '{search_term}'"
+            )
+            if progress:
+                progress("scrapers_failed", 1)
+            return []
+        try:
+            self.logger.info(f"Starting scrape for '{search_term}' with {scraper.__class__.__name__}")
+            results = scraper.fetch_results(search_term, progress=progress, deadline=deadline)
+            if progress:
+                progress("items_fetched", len(results))
+            return results
+        except Exception as e:
+            self.logger.error(f"Error while scraping with {scraper.__class__.__name__}: {str(e)}", exc_info=True)
+            if progress:
+                progress("scrapers_failed", 1)
+            return []
+        finally:
+            pool.release(scraper.RETAILER)
+
+    def _run_scrapers_concurrently(self, search_term: str, selected_scrapers: list, timeout=None, failures=None,
+                                   pool=None) -> list:
+        """
+        Run all selected scrapers in parallel and collect whatever finishes in time.
+
+        Each scraper gets at most `scraper_timeout` seconds and the whole fan-out at most
+        `request_timeout` seconds. Scrapers that miss their deadline are abandoned and the
+        results from the others are returned; the deadline is also passed to each scraper
+        so an abandoned one stops retrying instead of holding its worker thread.
+
+        Args:
+            search_term (str): The term to search for.
+            selected_scrapers (list): Scrapers to run.
+            timeout (float): Overall deadline in seconds. Defaults to `self.request_timeout`.
+            failures (ScrapeFailures): Records failed retailers and forwards progress.
+            pool (ScraperPool): Pool to run the scrapers on. Defaults to `self.pool`.
+
+        Returns:
+            list: Combined results, in the order the scrapers were configured.
+        """
+        pool = pool or self.pool
+        failures = failures or ScrapeFailures()
+        start = time.monotonic()
+        request_deadline = start + (timeout if timeout is not None else self.request_timeout)
+        scraper_deadline = min(start + self.scraper_timeout, request_deadline)
+
+        futures = [
+            (scraper, pool.submit(
+                self._run_scraper, scraper, search_term, failures.for_retailer(scraper.RETAILER), scraper_deadline, pool
+            ))
+            for scraper in selected_scrapers
+        ]
+
+        results = []
+        for scraper, future in futures:
+            try:
+                results.extend(future.result(timeout=max(0, scraper_deadline - time.monotonic())))
+            except FutureTimeoutError:
+                future.cancel()  # Only stops a scraper that has not started; a running one stops at its deadline
+                self.logger.warning(
+                    f"{scraper.__class__.__name__} did not finish within its deadline for '{search_term}'. "
+                    f"Returning partial results."
+                )
+                failures.for_retailer(scraper.RETAILER)("scrapers_failed", 1)
+
+        self.logger.info(
+            f"Concurrent scrape for '{search_term}' finished in {time.monotonic() - start:.2f}s"
+        )
+        return results
+
+    async def fetch_data_async(self, search_term: str, timeout=None, category=None, progress=None, client=None) -> list:
+        """
+        Asyncio counterpart of `fetch_data`: all retailers, and all pages of each, are fetched
+        as tasks on the running event loop. Classification and relevance scoring run in worker
+        threads so they do not block the loop.
+
+        Per-retailer caps of a ScraperPool and request coalescing apply to the threaded
+        path only; here the shared rate limiter and the client's connection limits
+        bound the requests in flight.
+
+        Args:
+            search_term (str): The term to search for.
+            timeout (float): Overall deadline in seconds for the scrape. Defaults to `self.request_timeout`.
+            category (str): Precomputed category. Classified here if omitted.
+            progress (callable): Optional progress reporter.
+            client (httpx.AsyncClient): Client to send requests through. A temporary one is
+                created when omitted; pass a shared one when running many scrapes at once.
+
+        Returns:
+            list: Filtered list of relevant results.
+        """
+        if client is None:
+            async with create_async_client() as client:
+                return await self.fetch_data_async(search_term, timeout, category, progress, client)
+
+        category = category or await asyncio.to_thread(self.classifier.classify, search_term)
+        selected_scrapers = self.scrapers.get(category, [])
+
+        self.logger.info(f"Search term '{search_term}' classified as category: {category}")
+        if not selected_scrapers:
+            self.logger.info(f"No scrapers configured for category: {category}")
+            return []
+
+        key = ttl = None
+        if self.result_cache is not None:
+            key = self.result_cache.make_key(search_term, category)
+            ttl = self.result_cache.ttl_for(scraper.RETAILER for scraper in selected_scrapers)
+            cached = self.result_cache.get(
+                key, refresh=lambda: self._scrape_and_filter(search_term, selected_scrapers, timeout), ttl=ttl
+            )
+            if cached is not None:
+                return cached
+
+        failures = ScrapeFailures(progress)
+        results = await self._run_scrapers_async(search_term, selected_scrapers, client, timeout, failures)
+        if results:
+            filtered_results = await asyncio.to_thread(
+                self.relevance_checker.filter_relevant_results, search_term, results, progress
+            )
             self.logger.info(f"Results after filtering: {len(filtered_results)}")
-            return filtered_results
+            await asyncio.to_thread(self._store_products, search_term, filtered_results)
         else:
             self.logger.info(f"No results found for search term: '{search_term}'")
+            filtered_results = []
+
+        if key is not None:
+            self.result_cache.put(key, filtered_results, ttl, partial=bool(failures.retailers))
+        return filtered_results
+
+    async def fetch_many_async(self, search_terms: list, max_concurrent_terms=100, timeout=None) -> dict:
+        """
+        Scrape many terms on one event loop through a single shared client.
+
+        Terms are classified in one batch, then up to `max_concurrent_terms` are scraped at once.
+        From synchronous code, call it with `asyncio.run(manager.fetch_many_async(terms))`.
+
+        Args:
+            search_terms (list): Terms to scrape.
+            max_concurrent_terms (int): Maximum terms in flight.
+            timeout (float): Per-term deadline in seconds.
+
+        Returns:
+            dict: Search term -> filtered results. Terms that failed map to an empty list.
+        """
+        search_terms = list(dict.fromkeys(search_terms))
+        predictions = await asyncio.to_thread(self.classifier.classify_batch, search_terms)
+        slots = asyncio.Semaphore(max_concurrent_terms)
+
+        async def _fetch(client, search_term, category):
+            async with slots:
+                try:
+                    return await self.fetch_data_async(search_term, timeout, category, client=client)
+                except Exception as e:
+                    self.logger.error(f"Async scrape for '{search_term}' failed: {str(e)}", exc_info=True)
+                    return []
+
+        async with create_async_client() as client:
+            results = await asyncio.gather(*(
+                _fetch(client, search_term, prediction["label"])
+                for search_term, prediction in zip(search_terms, predictions)
+            ))
+        return dict(zip(search_terms, results))
+
+    async def _run_scraper_async(self, scraper, search_term: str, client, progress=None, deadline=None) -> list:
+        """
+        Async counterpart of `_run_scraper`; errors are logged and yield an empty list.
+        """
+        try:
+            self.logger.info(f"Starting async scrape for '{search_term}' with {scraper.__class__.__name__}")
+            results = await scraper.fetch_results_async(search_term, client, progress=progress, deadline=deadline)
+            if progress:
+                progress("items_fetched", len(results))
+            return results
+        except Exception as e:
+            self.logger.error(f"Error while scraping with {scraper.__class__.__name__}: {str(e)}", exc_info=True)
+            if progress:
+                progress("scrapers_failed", 1)
             return []
 
-    def save_results_to_excel(self, results: list, search_term: str, data_dir=None):
+    async def _run_scrapers_async(self, search_term: str, selected_scrapers: list, client, timeout=None,
+                                  failures=None) -> list:
         """
-        Save the scraped results to an Excel file.
+        Run all selected scrapers as tasks under the same deadlines as `_run_scrapers_concurrently`.
+
+        Returns:
+            list: Combined results, in the order the scrapers were configured.
+        """
+        failures = failures or ScrapeFailures()
+        start = time.monotonic()
+        request_deadline = start + (timeout if timeout is not None else self.request_timeout)
+        scraper_deadline = min(start + self.scraper_timeout, request_deadline)
+
+        tasks = [
+            asyncio.create_task(self._run_scraper_async(
+                scraper, search_term, client, failures.for_retailer(scraper.RETAILER), scraper_deadline
+            ))
+            for scraper in selected_scrapers
+        ]
+        _, pending = await asyncio.wait(tasks, timeout=max(0, scraper_deadline - time.monotonic()))
+
+        results = []
+        for scraper, task in zip(selected_scrapers, tasks):
+            if task in pending:
+                task.cancel()
+                self.logger.warning(
+                    f"{scraper.__class__.__name__} did not finish within its deadline for '{search_term}'. "
+                    f"Returning partial results."
+                )
+                failures.for_retailer(scraper.RETAILER)("scrapers_failed", 1)
+            else:
+                results.extend(task.result())
+
+        self.logger.info(f"Async scrape for '{search_term}' finished in {time.monotonic() - start:.2f}s")
+        return results
+
+    def save_results(self, results: list, search_term: str, data_dir=None, fmt="xlsx", background=False):
+        """
+        Save the scraped results in the given format.
 
         Args:
             results (list): List of results to save.
             search_term (str): Search term for naming the file.
             data_dir (str): Directory to save the file. Defaults to `self.data_dir`.
+            fmt (str): One of "xlsx", "parquet", "csv.gz" or "jsonl".
+            background (bool): Write on the export executor and return without waiting. The
+                file appears under its final name once complete.
+
+        Returns:
+            str: Path of the output file.
         """
         data_dir = data_dir or self.data_dir
-        output_file = os.path.join(data_dir, f"{search_term.replace(' ', '_')}_results.xlsx")
+        output_file = os.path.join(data_dir, f"{search_term.replace(' ', '_')}_results.{fmt}")
 
-        try:
-            df = pd.DataFrame(results)
-            df.to_excel(output_file, index=False)
-            self.logger.info(f"Results saved to {output_file}")
-        except Exception as e:
-            self.logger.error(f"Failed to save results to Excel: {str(e)}", exc_info=True)
+        def _write():
+            try:
+                write_results(results, output_file, fmt)
+            except Exception as e:
+                self.logger.error(f"Failed to save results to {output_file}: {str(e)}", exc_info=True)
+
+        if background:
+            self.export_executor.submit(_write)
+        else:
+            _write()
+        return output_file
+
+    def save_results_to_excel(self, results: list, search_term: str, data_dir=None):
+        """
+        Save the scraped results to an Excel file.
+
+        Args:
+            results (list): List of results to save.
+            search_term (str): Search term for naming the file.
+            data_dir (str): Directory to save the file. Defaults to `self.data_dir`.
+
+        Returns:
+            str: Path of the output file.
+        """
+        return self.save_results(results, search_term, data_dir, fmt="xlsx")
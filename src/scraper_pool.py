@@ -0,0 +1,46 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ScraperPool:
+    """
+    Worker threads that scrapes run on, with optional caps on concurrent scrapes per retailer.
+
+    ScraperManager runs interactive scrapes on its own pool. A bulk run passes a separate pool
+    to `fetch_data`, so its retailer caps, and the scrapes queued behind them, never hold up
+    interactive requests.
+    """
+    def __init__(self, max_workers=8, retailer_limits=None, name="scraper"):
+        self.name = name
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.retailer_limits = dict(retailer_limits or {})  # Retailer id (e.g. "amazon") -> max concurrent scrapes
+        self._semaphores = {
+            retailer: threading.BoundedSemaphore(limit) for retailer, limit in self.retailer_limits.items()
+        }
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def acquire(self, retailer: str, deadline=None) -> bool:
+        """
+        Take a scrape slot for `retailer`, waiting at most until `deadline`.
+
+        Args:
+            retailer (str): Retailer id.
+            deadline (float): Optional `time.monotonic()` time to stop waiting at.
+
+        Returns:
+            bool: True if a slot is held (always, for uncapped retailers); pair it with `release`.
+        """
+        semaphore = self._semaphores.get(retailer)
+        if semaphore is None:
+            return True
+        if deadline is None:
+            return semaphore.acquire()
+        return semaphore.acquire(timeout=max(0, deadline - time.monotonic()))
+
+    def release(self, retailer: str):
+        semaphore = self._semaphores.get(retailer)
+        if semaphore is not None:
+            semaphore.release()
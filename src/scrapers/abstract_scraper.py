@@ -1,13 +1,97 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from .http_client import DEFAULT_TIMEOUT, get_shared_session
+from .rate_limiter import RATE_LIMITER
+
+# Outcomes of a scraper's response check, shared by its sync and async request loops
+OK = "ok"
+RETRY = "retry"
+GIVE_UP = "give_up"
 
 class Scraper(ABC):
     """
     Abstract base class for all scrapers.
+
+    Scrapers send requests through `self.session`, which defaults to the process-wide
+    pooled session so connections are reused across requests, pages and scrapers, and
+    acquire from `self.rate_limiter` before each request so the per-host request rate is
+    bounded across all concurrent scrapes.
+
+    `fetch_results_async` is the asyncio counterpart, sending requests through an httpx
+    AsyncClient from `http_client.create_async_client`.
+
+    Both accept an optional `deadline` (a `time.monotonic()` timestamp). Once it passes,
+    implementations stop retrying and paginating and return what they have, so a scrape
+    abandoned by its caller does not keep holding a worker thread.
+
+    Subclasses keep the sync and async paths in step by sharing everything but the I/O:
+    request building, the response check (returning OK, RETRY or GIVE_UP) and merging of
+    pages live in helpers that both paths call.
     """
+    RETAILER = None  # Short retailer identifier, e.g. "amazon"; set by each subclass
+
+    def __init__(self, session=None, timeout=DEFAULT_TIMEOUT, rate_limiter=None):
+        self.session = session or get_shared_session()
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+
     @abstractmethod
-    def fetch_results(self, search_term: str) -> list:
+    def fetch_results(self, search_term: str, progress=None, deadline=None) -> list:
         """
         Fetch product data based on the search term.
         Must be implemented by all subclasses.
+
+        `progress`, when given, is a `progress(counter, amount)` callable; implementations
+        report each successfully fetched page as "pages_fetched" and each page they gave up
+        on (blocked, failed or out of time) as "pages_failed". `deadline`, when given,
+        is the `time.monotonic()` time after which no further request is sent.
         """
         pass
+
+    async def fetch_results_async(self, search_term: str, client, progress=None, deadline=None) -> list:
+        """
+        Fetch product data on the event loop.
+
+        The default implementation runs `fetch_results` in a worker thread; scrapers override
+        it with a native implementation that sends requests through `client`.
+
+        Args:
+            search_term (str): The term to search for.
+            client (httpx.AsyncClient): Client shared by the scrapes on this event loop.
+            progress (callable): Optional progress reporter.
+            deadline (float): Optional `time.monotonic()` time to stop by.
+
+        Returns:
+            list: A list of dictionaries containing product details.
+        """
+        return await asyncio.to_thread(self.fetch_results, search_term, progress, deadline)
+
+    def _begin_attempt(self, url: str, deadline=None):
+        """
+        Wait for the rate limiter before a request attempt.
+
+        Returns:
+            float or None: Timeout for the request, or None if `deadline` passes first.
+        """
+        return self._request_timeout(deadline) if self.rate_limiter.acquire(url, deadline) else None
+
+    async def _begin_attempt_async(self, url: str, deadline=None):
+        """
+        Async counterpart of `_begin_attempt`.
+        """
+        return self._request_timeout(deadline) if await self.rate_limiter.acquire_async(url, deadline) else None
+
+    def _request_timeout(self, deadline):
+        """
+        Timeout for the next request: `self.timeout`, shortened to the time left before `deadline`.
+
+        Returns:
+            float or None: Seconds, or None if the deadline has already passed.
+        """
+        if deadline is None:
+            return self.timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        return min(self.timeout, remaining)
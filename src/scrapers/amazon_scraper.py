@@ -1,68 +1,187 @@
+import asyncio
+import httpx
 import requests
 from bs4 import BeautifulSoup
 import random
-import time
 from fake_useragent import UserAgent
-from .abstract_scraper import Scraper
+from lxml import etree
+from .abstract_scraper import OK, RETRY, Scraper
+from .http_client import DEFAULT_TIMEOUT
 from logger_config import get_logger
 
 # Initialize logger
 logger = get_logger(__name__)
 
+
+def _has_class(name: str) -> str:
+    # XPath predicate equivalent to BeautifulSoup's single-class match
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Precompiled XPath equivalents of the BeautifulSoup lookups in `_parse_results`; each
+# returns matches in document order, so the first one is what `find()` would return
+_XPATH_RESULTS = etree.XPath("//div[@data-component-type='s-search-result']")
+_XPATH_NAME = etree.XPath(f".//span[{_has_class('a-size-base-plus')}]")
+_XPATH_NAME_FALLBACK = etree.XPath(f".//span[{_has_class('a-text-normal')}]")
+# A multi-class string matches the whole class attribute in BeautifulSoup, not each class
+_XPATH_DESCRIPTION = etree.XPath(".//span[normalize-space(@class)='a-size-base-plus a-color-base']")
+_XPATH_LINK = etree.XPath(f".//a[{_has_class('a-link-normal')}][@href]")
+_XPATH_PRICE_WHOLE = etree.XPath(f".//span[{_has_class('a-price-whole')}]")
+_XPATH_PRICE_FRACTION = etree.XPath(f".//span[{_has_class('a-price-fraction')}]")
+_XPATH_RATING = etree.XPath(f".//span[{_has_class('a-icon-alt')}]")
+# BeautifulSoup's `.text` leaves out comments and script/style/template contents
+_XPATH_TEXT = etree.XPath("descendant::text()[not(ancestor::script or ancestor::style or ancestor::template)]", smart_strings=False)
+
+# Sent when fake_useragent cannot load its browser data
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"
+
+# Amazon serves UTF-8; fixing the encoding matches what BeautifulSoup detects
+_HTML_PARSER = etree.HTMLParser(encoding="utf-8")
+
+
 class AmazonScraper(Scraper):
+    RETAILER = "amazon"
     BASE_URL = "https://www.amazon.ca/s?k="
+    PARSERS = ("lxml", "bs4")
+    MAX_RETRIES = 5  # Attempts per search
+    RETRY_DELAY = 2  # Seconds; doubled on each attempt when a response has no Retry-After
+
+    def __init__(self, session=None, timeout=DEFAULT_TIMEOUT, rate_limiter=None, parser="lxml"):
+        super().__init__(session=session, timeout=timeout, rate_limiter=rate_limiter)
+        if parser not in self.PARSERS:
+            raise ValueError(f"Unknown parser '{parser}'. Expected one of {self.PARSERS}")
+        # "lxml" evaluates precompiled XPath directly on the lxml tree; "bs4" builds a
+        # BeautifulSoup tree. Both produce identical results.
+        self.parser = parser
 
-    def fetch_results(self, search_term: str) -> list:
+    def fetch_results(self, search_term: str, progress=None, deadline=None) -> list:
         """
         Fetch search results from Amazon for a given search term.
 
         Args:
             search_term (str): The search term to query Amazon.
+            progress (callable): Optional progress reporter.
+            deadline (float): Optional `time.monotonic()` time after which retries stop.
 
         Returns:
             list: A list of dictionaries containing product details.
         """
-        query = search_term.replace(" ", "+")
-        url = self.BASE_URL + query
-        
-        # Initialize user agent
+        url, user_agents = self._search_request(search_term)
+
+        for attempt in range(self.MAX_RETRIES):
+            timeout = self._begin_attempt(url, deadline)
+            if timeout is None:
+                return self._give_up(f"Deadline passed before attempt {attempt + 1} for URL: {url}.", progress)
+            headers = self._request_headers(user_agents)
+            logger.info(f"Attempting to fetch URL: {url} (Attempt {attempt + 1})")
+            logger.debug(f"User-Agent details: {headers}")
+            try:
+                response = self.session.get(url, headers=headers, timeout=timeout)
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Request failed: {e}. Retrying... (Attempt {attempt + 1})")
+                continue
+
+            if self._check_response(url, response, attempt, progress) == OK:
+                return self.parse_html(response.content)
+
+        return self._give_up(f"Failed to fetch data after {self.MAX_RETRIES} attempts.", progress)
+
+    async def fetch_results_async(self, search_term: str, client, progress=None, deadline=None) -> list:
+        """
+        Fetch search results from Amazon on the event loop.
+
+        Args:
+            search_term (str): The search term to query Amazon.
+            client (httpx.AsyncClient): Client shared by the scrapes on this event loop.
+            progress (callable): Optional progress reporter.
+            deadline (float): Optional `time.monotonic()` time after which retries stop.
+
+        Returns:
+            list: A list of dictionaries containing product details.
+        """
+        url, user_agents = self._search_request(search_term)
+
+        for attempt in range(self.MAX_RETRIES):
+            timeout = await self._begin_attempt_async(url, deadline)
+            if timeout is None:
+                return self._give_up(f"Deadline passed before attempt {attempt + 1} for URL: {url}.", progress)
+            headers = self._request_headers(user_agents)
+            logger.info(f"Attempting to fetch URL: {url} (Attempt {attempt + 1})")
+            try:
+                response = await client.get(url, headers=headers, timeout=timeout)
+            except httpx.HTTPError as e:
+                logger.error(f"Request failed: {e}. Retrying... (Attempt {attempt + 1})")
+                continue
+
+            if self._check_response(url, response, attempt, progress) == OK:
+                # Parsing is CPU-bound; keep it off the event loop
+                return await asyncio.to_thread(self.parse_html, response.content)
+
+        return self._give_up(f"Failed to fetch data after {self.MAX_RETRIES} attempts.", progress)
+
+    def _search_request(self, search_term: str):
+        """
+        Build the search URL and a User-Agent source for one search.
+
+        Returns:
+            tuple: (url, user_agents), where `user_agents()` returns a User-Agent string.
+        """
+        url = self.BASE_URL + search_term.replace(" ", "+")
         try:
             ua = UserAgent()
+            return url, lambda: ua.random
         except Exception as e:
             logger.warning(f"Failed to initialize UserAgent. Using a default User-Agent. Error: {e}")
-            ua = {"random": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3"}
-        
-        max_retries = 5
-        retry_delay = 2
+            return url, lambda: DEFAULT_USER_AGENT
 
-        for attempt in range(max_retries):
-            try:
-                headers = {
-                    "User-Agent": ua.random,
-                    "Accept-Language": "en-US, en;q=0.5",
-                }
-
-                logger.info(f"Attempting to fetch URL: {url} (Attempt {attempt + 1})")
-                logger.debug(f"User-Agent details: {headers}")
-                response = requests.get(url, headers=headers, timeout=10)
-
-                if response.status_code == 200:
-                    logger.info(f"Successfully fetched data from URL: {url}")
-                    soup = BeautifulSoup(response.content, "lxml")
-                    return self._parse_results(soup)
-                elif response.status_code == 503:
-                    logger.warning(f"503 error detected. Retrying... (Attempt {attempt + 1})")
-                else:
-                    logger.error(f"Unexpected status code {response.status_code}. Retrying...")
-
-                time.sleep(retry_delay * (2 ** attempt))
+    @staticmethod
+    def _request_headers(user_agents) -> dict:
+        # A fresh User-Agent on every attempt
+        return {
+            "User-Agent": user_agents(),
+            "Accept-Language": "en-US, en;q=0.5",
+        }
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request failed: {e}. Retrying... (Attempt {attempt + 1})")
+    def _check_response(self, url: str, response, attempt: int, progress=None) -> str:
+        """
+        Classify a response for the retry loops: OK for a page to parse, otherwise RETRY
+        after backing off. Amazon errors are usually transient, so every failure is retried.
+        """
+        if response.status_code == 200:
+            logger.info(f"Successfully fetched data from URL: {url}")
+            if progress:
+                progress("pages_fetched", 1)
+            return OK
+        if response.status_code in (429, 503):
+            logger.warning(f"{response.status_code} error detected. Retrying... (Attempt {attempt + 1})")
+        else:
+            logger.error(f"Unexpected status code {response.status_code}. Retrying...")
 
-        logger.error(f"Failed to fetch data after {max_retries} attempts.")
+        # Back off through the shared limiter so every request to Amazon pauses, not just this one
+        self.rate_limiter.honor_retry_after(url, response, self.RETRY_DELAY * (2 ** attempt))
+        return RETRY
+
+    @staticmethod
+    def _give_up(message: str, progress=None) -> list:
+        logger.error(message)
+        if progress:
+            progress("pages_failed", 1)
         return []
-    
+
+    def parse_html(self, content: bytes) -> list:
+        """
+        Parse a search results page with the configured parser backend.
+
+        Args:
+            content (bytes): Raw HTML of the page.
+
+        Returns:
+            list: A list of dictionaries containing product details.
+        """
+        if self.parser == "lxml":
+            return self._parse_results_lxml(etree.fromstring(content, _HTML_PARSER))
+        return self._parse_results(BeautifulSoup(content, "lxml"))
+
     def _parse_results(self, soup: BeautifulSoup) -> list:
         """
         Parse the HTML content to extract product details.
@@ -114,3 +233,61 @@ class AmazonScraper(Scraper):
             logger.error(f"Error during parsing: {e}", exc_info=True)
 
         return product_list
+
+    def _parse_results_lxml(self, root) -> list:
+        """
+        Parse an lxml HTML tree to extract product details, mirroring `_parse_results`.
+
+        Args:
+            root: Root element of the parsed page.
+
+        Returns:
+            list: A list of dictionaries containing product details.
+        """
+        product_list = []
+        try:
+            for item in _XPATH_RESULTS(root):
+                # Extract product name
+                name_tags = _XPATH_NAME(item) or _XPATH_NAME_FALLBACK(item)
+                name = _text(name_tags[0]).strip() if name_tags else "N/A"
+
+                # Extract product description
+                description_tags = _XPATH_DESCRIPTION(item)
+                description = _text(description_tags[0]).strip() if description_tags else "N/A"
+
+                # Extract product link
+                link_tags = _XPATH_LINK(item)
+                full_link = f"https://www.amazon.ca{link_tags[0].get('href')}" if link_tags else "N/A"
+
+                # Extract product price
+                price_whole = _XPATH_PRICE_WHOLE(item)
+                price_fraction = _XPATH_PRICE_FRACTION(item)
+                price = (
+                    f"{_text(price_whole[0]).strip()}.{_text(price_fraction[0]).strip()}"
+                    if price_whole and price_fraction else "N/A"
+                )
+
+                # Extract product rating
+                rating_tags = _XPATH_RATING(item)
+                rating = _text(rating_tags[0]).split(" ")[0] if rating_tags else "N/A"
+
+                # Add product details to the list
+                product_list.append({
+                    "Name": name,
+                    "Description": description,
+                    "Price": price,
+                    "URL": full_link,
+                    "Rating": rating,
+                })
+
+            logger.info(f"Successfully parsed {len(product_list)} products.")
+        except Exception as e:
+            logger.error(f"Error during parsing: {e}", exc_info=True)
+
+        return product_list
+
+
+
+def _text(element) -> str:
+    # Concatenated descendant text, like BeautifulSoup's `.text`
+    return "".join(_XPATH_TEXT(element))
@@ -1,14 +1,21 @@
-import requests
+import asyncio
 import random
-import time
-from .abstract_scraper import Scraper
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import requests
+from .abstract_scraper import GIVE_UP, OK, RETRY, Scraper
+from .http_client import DEFAULT_TIMEOUT
 from logger_config import get_logger
 
 # Initialize logger
 logger = get_logger(__name__)
 
 class BestBuyScraper(Scraper):
+    RETAILER = "bestbuy"
     BASE_API_URL = "https://www.bestbuy.ca/api/v2/json/search"
+    PAGE_SIZE = 24
+    MAX_RETRIES = 2  # Retries per page after a 429/503
+    RETRY_DELAY = 2  # Seconds to pause the host when a throttling response has no Retry-After
 
     # List of User-Agent strings
     USER_AGENTS = [
@@ -19,71 +26,253 @@ class BestBuyScraper(Scraper):
         "Mozilla/5.0 (iPad; CPU OS 14_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15A372 Safari/604.1",
     ]
 
-    def fetch_results(self, search_term: str) -> list:
+    def __init__(self, session=None, timeout=DEFAULT_TIMEOUT, rate_limiter=None, max_pages=10, concurrency=4):
+        super().__init__(session=session, timeout=timeout, rate_limiter=rate_limiter)
+        self.max_pages = max_pages  # Upper bound on pages fetched per search
+        self.concurrency = concurrency  # Pages fetched in parallel after the first
+
+    def fetch_results(self, search_term: str, progress=None, deadline=None) -> list:
         """
         Fetch product data from BestBuy API based on the search term.
 
+        The first page is fetched on its own to learn the total page count; the remaining
+        pages (up to `max_pages`) are then fetched concurrently and merged in page order.
+
         Args:
             search_term (str): The search term to query BestBuy.
+            progress (callable): Optional progress reporter.
+            deadline (float): Optional `time.monotonic()` time after which no more pages are requested.
 
         Returns:
             list: A list of dictionaries containing product details.
         """
         query = search_term.replace(" ", "+")
-        params = {
-            "query": query,
-            "sortBy": "relevance",
-            "page": 1,
-            "pageSize": 24,
-        }
 
-        all_results = []
+        data = self._fetch_page(search_term, query, 1, progress, deadline)
+        all_results = self._first_page_results(data, progress)
+        if not all_results:
+            return []
 
-        while True:
-            headers = {
-                "User-Agent": random.choice(self.USER_AGENTS),
-                "Accept": "application/json",
-                "Referer": f"https://www.bestbuy.ca/en-ca/search?search={query}",
-            }
+        pages = self._remaining_pages(data)
+        if pages is not None:
+            if pages:
+                with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pages))) as executor:
+                    # map() yields in page order regardless of completion order
+                    page_responses = list(executor.map(
+                        lambda page: self._fetch_page(search_term, query, page, progress, deadline), pages
+                    ))
+                self._merge_pages(all_results, pages, page_responses, progress)
+        else:
+            # Page count unknown: walk pages sequentially until one comes back empty
+            for page in range(2, self.max_pages + 1):
+                page_data = self._fetch_page(search_term, query, page, progress, deadline)
+                if not self._merge_next_page(all_results, page, page_data):
+                    break
 
-            logger.info(f"Fetching BestBuy results for: {search_term}, Page: {params['page']}")
-            logger.debug(f"Using headers: {headers}")
+        logger.info(f"Total products fetched: {len(all_results)}")
+        return all_results
 
-            try:
-                response = requests.get(
-                    self.BASE_API_URL,
-                    headers=headers,
-                    params=params,
-                    timeout=10
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    products = self._parse_results(data)
-
-                    if not products:
-                        logger.info(f"No more products found on page {params['page']}. Stopping.")
-                        break
-
-                    all_results.extend(products)
-                    logger.info(f"Page {params['page']} fetched successfully. Total products so far: {len(all_results)}")
-
-                    # Increment the page for pagination
-                    params["page"] += 1
-
-                    # Random delay between 1 and 3 seconds
-                    time.sleep(random.uniform(1, 3))
-                else:
-                    logger.warning(f"Failed to fetch data. Status code: {response.status_code}")
-                    break
+    def _fetch_page(self, search_term: str, query: str, page: int, progress=None, deadline=None):
+        """
+        Fetch one page of search results, acquiring from the shared per-host rate limiter
+        before each attempt and retrying throttled (429/503) responses.
+
+        Args:
+            search_term (str): The original search term, for logging.
+            query (str): The encoded query.
+            page (int): 1-based page number.
+            progress (callable): Optional progress reporter.
+            deadline (float): Optional `time.monotonic()` time after which no attempt is made.
+
+        Returns:
+            dict: The decoded JSON response, or None if the request failed.
+        """
+        params, headers = self._page_request(query, page)
 
+        for attempt in range(self.MAX_RETRIES + 1):
+            timeout = self._begin_attempt(self.BASE_API_URL, deadline)
+            if timeout is None:
+                logger.warning(f"Deadline passed before fetching page {page}. Giving up.")
+                return None
+            logger.info(f"Fetching BestBuy results for: {search_term}, Page: {page}")
+            logger.debug(f"Using headers: {headers}")
+            try:
+                response = self.session.get(self.BASE_API_URL, headers=headers, params=params, timeout=timeout)
             except requests.exceptions.RequestException as e:
-                logger.error(f"Request failed: {e}", exc_info=True)
-                break
+                logger.error(f"Request for page {page} failed: {e}", exc_info=True)
+                return None
+
+            outcome, data = self._check_response(page, response, attempt, progress)
+            if outcome != RETRY:
+                return data
+
+        logger.warning(f"Giving up on page {page} after {self.MAX_RETRIES + 1} attempts")
+        return None
+
+    async def fetch_results_async(self, search_term: str, client, progress=None, deadline=None) -> list:
+        """
+        Fetch product data from BestBuy API on the event loop.
+
+        Like `fetch_results`, the first page is fetched on its own; the remaining pages are
+        then fetched as concurrent tasks (at most `concurrency` at a time) and merged in
+        page order.
+
+        Args:
+            search_term (str): The search term to query BestBuy.
+            client (httpx.AsyncClient): Client shared by the scrapes on this event loop.
+            progress (callable): Optional progress reporter.
+            deadline (float): Optional `time.monotonic()` time after which no more pages are requested.
+
+        Returns:
+            list: A list of dictionaries containing product details.
+        """
+        query = search_term.replace(" ", "+")
+
+        data = await self._fetch_page_async(client, search_term, query, 1, progress, deadline)
+        all_results = self._first_page_results(data, progress)
+        if not all_results:
+            return []
+
+        pages = self._remaining_pages(data)
+        if pages is not None:
+            slots = asyncio.Semaphore(self.concurrency)
+
+            async def _fetch(page):
+                async with slots:
+                    return await self._fetch_page_async(client, search_term, query, page, progress, deadline)
+
+            # gather() returns in page order regardless of completion order
+            page_responses = await asyncio.gather(*(_fetch(page) for page in pages))
+            self._merge_pages(all_results, pages, page_responses, progress)
+        else:
+            # Page count unknown: walk pages sequentially until one comes back empty
+            for page in range(2, self.max_pages + 1):
+                page_data = await self._fetch_page_async(client, search_term, query, page, progress, deadline)
+                if not self._merge_next_page(all_results, page, page_data):
+                    break
 
         logger.info(f"Total products fetched: {len(all_results)}")
         return all_results
 
+    async def _fetch_page_async(self, client, search_term: str, query: str, page: int, progress=None, deadline=None):
+        """
+        Async counterpart of `_fetch_page`.
+
+        Returns:
+            dict: The decoded JSON response, or None if the request failed.
+        """
+        params, headers = self._page_request(query, page)
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            timeout = await self._begin_attempt_async(self.BASE_API_URL, deadline)
+            if timeout is None:
+                logger.warning(f"Deadline passed before fetching page {page}. Giving up.")
+                return None
+            logger.info(f"Fetching BestBuy results for: {search_term}, Page: {page}")
+            try:
+                response = await client.get(self.BASE_API_URL, headers=headers, params=params, timeout=timeout)
+            except httpx.HTTPError as e:
+                logger.error(f"Request for page {page} failed: {e}", exc_info=True)
+                return None
+
+            outcome, data = self._check_response(page, response, attempt, progress)
+            if outcome != RETRY:
+                return data
+
+        logger.warning(f"Giving up on page {page} after {self.MAX_RETRIES + 1} attempts")
+        return None
+
+    def _check_response(self, page: int, response, attempt: int, progress=None):
+        """
+        Classify one page response for the retry loops.
+
+        Returns:
+            tuple: (outcome, data). OK with the decoded JSON; RETRY after a throttling
+            response (the host is paused first); GIVE_UP with None for any other status or
+            an undecodable body.
+        """
+        if response.status_code == 200:
+            try:
+                data = response.json()
+            except ValueError as e:
+                logger.error(f"Request for page {page} failed: {e}", exc_info=True)
+                return GIVE_UP, None
+            if progress:
+                progress("pages_fetched", 1)
+            return OK, data
+        if response.status_code not in (429, 503):
+            logger.warning(f"Failed to fetch page {page}. Status code: {response.status_code}")
+            return GIVE_UP, None
+        logger.warning(f"{response.status_code} on page {page}. Retrying... (Attempt {attempt + 1})")
+        self.rate_limiter.honor_retry_after(self.BASE_API_URL, response, self.RETRY_DELAY)
+        return RETRY, None
+
+    def _first_page_results(self, data, progress=None) -> list:
+        """
+        Parse page 1, reporting it as failed if it could not be fetched.
+        """
+        if data is None:
+            if progress:
+                progress("pages_failed", 1)
+            return []
+        results = self._parse_results(data)
+        if not results:
+            logger.info("No products found on page 1. Stopping.")
+        return results
+
+    def _remaining_pages(self, data):
+        """
+        Pages after the first to fetch concurrently, or None if the response has no page count.
+        """
+        if "totalPages" not in data:
+            return None
+        return range(2, min(int(data.get("totalPages") or 1), self.max_pages) + 1)
+
+    def _merge_pages(self, all_results: list, pages, page_responses, progress=None):
+        """
+        Append the products of concurrently fetched pages to `all_results` in page order.
+        """
+        for page, page_data in zip(pages, page_responses):
+            if page_data is None and progress:
+                progress("pages_failed", 1)
+            all_results.extend(self._parse_results(page_data) if page_data else [])
+            logger.info(f"Page {page} merged. Total products so far: {len(all_results)}")
+
+    def _merge_next_page(self, all_results: list, page: int, page_data) -> bool:
+        """
+        Append one sequentially fetched page to `all_results`.
+
+        Returns:
+            bool: False once a page has no products, ending the walk.
+        """
+        products = self._parse_results(page_data) if page_data else []
+        if not products:
+            logger.info(f"No more products found on page {page}. Stopping.")
+            return False
+        all_results.extend(products)
+        logger.info(f"Page {page} fetched successfully. Total products so far: {len(all_results)}")
+        return True
+
+    def _page_request(self, query: str, page: int):
+        """
+        Build the query parameters and headers for one search page request.
+
+        Returns:
+            tuple: (params, headers).
+        """
+        params = {
+            "query": query,
+            "sortBy": "relevance",
+            "page": page,
+            "pageSize": self.PAGE_SIZE,
+        }
+        headers = {
+            "User-Agent": random.choice(self.USER_AGENTS),
+            "Accept": "application/json",
+            "Referer": f"https://www.bestbuy.ca/en-ca/search?search={query}",
+        }
+        return params, headers
+
     def _parse_results(self, data: dict) -> list:
         """
         Parse the JSON response and extract product data.
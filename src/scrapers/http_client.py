@@ -0,0 +1,94 @@
+import threading
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from logger_config import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+DEFAULT_TIMEOUT = 10  # Seconds, applied to both connect and read
+DEFAULT_POOL_CONNECTIONS = 10  # Number of per-host pools kept alive
+DEFAULT_POOL_MAXSIZE = 8  # Maximum keep-alive connections per host
+DEFAULT_ASYNC_MAX_CONNECTIONS = 200  # Concurrent connections per async client, across hosts
+DEFAULT_ASYNC_MAX_KEEPALIVE = 20  # Idle connections an async client keeps open
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def create_session(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=True):
+    """
+    Create a requests Session backed by a keep-alive connection pool.
+
+    Args:
+        pool_connections (int): Number of hosts to keep connection pools for.
+        pool_maxsize (int): Maximum connections kept per host.
+        pool_block (bool): If True, callers wait for a free connection instead of opening
+            extra throwaway connections, which enforces `pool_maxsize` as a per-host limit.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_shared_session():
+    """
+    Return the process-wide session shared by all scrapers, creating it on first use.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+            logger.info(
+                f"Created shared HTTP session (pool_connections={DEFAULT_POOL_CONNECTIONS}, "
+                f"pool_maxsize={DEFAULT_POOL_MAXSIZE})"
+            )
+        return _shared_session
+
+
+def configure_shared_session(**kwargs):
+    """
+    Replace the shared session with one built from `create_session(**kwargs)`.
+
+    Scrapers created afterwards pick up the new session; existing scrapers keep theirs, so the
+    previous session is left open.
+
+    Returns:
+        requests.Session: The new shared session.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        _shared_session = create_session(**kwargs)
+    logger.info(f"Reconfigured shared HTTP session: {kwargs}")
+    return _shared_session
+
+
+def create_async_client(max_connections=DEFAULT_ASYNC_MAX_CONNECTIONS,
+                        max_keepalive_connections=DEFAULT_ASYNC_MAX_KEEPALIVE, timeout=DEFAULT_TIMEOUT):
+    """
+    Create an httpx AsyncClient for the scrapers' `fetch_results_async`.
+
+    The client's connections belong to the event loop that uses them, so create one per
+    loop (typically with `async with`) and share it across all concurrent scrapes there.
+
+    Args:
+        max_connections (int): Maximum concurrent connections; further requests wait for one.
+        max_keepalive_connections (int): Idle connections kept for reuse.
+        timeout (float): Default request timeout in seconds.
+
+    Returns:
+        httpx.AsyncClient: The configured client.
+    """
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+    return httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True)
@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from logger_config import get_logger
+
+# Initialize logger
+logger = get_logger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per second with bursts of up to `burst`.
+
+    Callers reserve a token under a lock and are told how long to wait for it, so waiting
+    happens outside the lock and works the same from threads (`acquire`) and asyncio
+    (`acquire_async`). Reservations queue fairly: with an empty bucket, each caller is
+    scheduled 1/rate seconds after the previous one.
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()  # Refill reference point; may lie in the future after a penalty
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token.
+
+        Returns:
+            float: Seconds the caller must wait before sending its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            self._tokens -= 1
+            debt = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return (self._updated - now) + debt
+
+    def acquire(self, deadline=None) -> bool:
+        """
+        Block the calling thread until a token is available.
+
+        Args:
+            deadline (float): Optional `time.monotonic()` time. If the token would only be
+                available after it, the reservation is returned and nothing is waited for.
+
+        Returns:
+            bool: True once the token is held, False if it would arrive after `deadline`.
+        """
+        delay = self.reserve()
+        if not self._within(delay, deadline):
+            return False
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+    async def acquire_async(self, deadline=None) -> bool:
+        """
+        Wait on the event loop until a token is available. See `acquire`.
+        """
+        delay = self.reserve()
+        if not self._within(delay, deadline):
+            return False
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return True
+
+    def _within(self, delay, deadline) -> bool:
+        if deadline is None or time.monotonic() + delay <= deadline:
+            return True
+        # Hand the token back so callers queued behind this one are not pushed back
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+        return False
+
+    def penalize(self, delay: float):
+        """
+        Stop handing out tokens for `delay` seconds, e.g. after a 429 with Retry-After.
+
+        Requests already reserved keep their slots; new reservations start after the pause.
+        """
+        with self._lock:
+            resume_at = time.monotonic() + delay
+            if resume_at > self._updated:
+                self._updated = resume_at
+                self._tokens = min(self._tokens, 1.0)
+
+
+class HostRateLimiter:
+    """
+    Process-wide registry of token buckets, one per host.
+    """
+    def __init__(self, default_rate=1.0, default_burst=2, host_limits=None):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.host_limits = dict(host_limits or {})  # host -> (rate, burst)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url_or_host: str) -> TokenBucket:
+        """
+        Return the bucket for a host, creating it on first use.
+
+        Args:
+            url_or_host (str): A full URL or a bare host name.
+        """
+        host = _host_of(url_or_host)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.host_limits.get(host, (self.default_rate, self.default_burst))
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    def scale(self, factor: float):
+        """
+        Multiply every host's rate and burst by `factor`, e.g. 1/N in each of N processes
+        sharing a budget, so together they neither exceed the rate nor the burst.
+
+        A burst below 1 still works: the bucket then holds a fraction of a token and the
+        first request after an idle spell waits for the rest.
+        """
+        with self._lock:
+            self.default_rate *= factor
+            self.default_burst *= factor
+            self.host_limits = {
+                host: (rate * factor, burst * factor) for host, (rate, burst) in self.host_limits.items()
+            }
+            for bucket in self._buckets.values():
+                with bucket._lock:
+                    bucket.rate *= factor
+                    bucket.burst *= factor
+                    bucket._tokens = min(bucket._tokens, bucket.burst)
+
+    def acquire(self, url_or_host: str, deadline=None) -> bool:
+        return self.bucket(url_or_host).acquire(deadline)
+
+    async def acquire_async(self, url_or_host: str, deadline=None) -> bool:
+        return await self.bucket(url_or_host).acquire_async(deadline)
+
+    def penalize(self, url_or_host: str, delay: float):
+        logger.warning(f"Pausing requests to {_host_of(url_or_host)} for {delay:.1f}s")
+        self.bucket(url_or_host).penalize(delay)
+
+    def honor_retry_after(self, url: str, response, default_delay: float) -> float:
+        """
+        Pause a host after a throttling response, using its Retry-After header when present.
+
+        Args:
+            url (str): The URL that was requested.
+            response: A requests or httpx response.
+            default_delay (float): Pause to apply when the header is missing or unparsable.
+
+        Returns:
+            float: The applied pause in seconds.
+        """
+        delay = parse_retry_after(response.headers.get("Retry-After"))
+        delay = default_delay if delay is None else delay
+        self.penalize(url, delay)
+        return delay
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given either as delta-seconds or as an HTTP date.
+
+    Returns:
+        float or None: Seconds to wait, or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _host_of(url_or_host: str) -> str:
+    return (urlsplit(url_or_host).hostname if "://" in url_or_host else url_or_host).lower()
+
+
+# Shared by every scraper in the process so concurrent requests stay polite together
+RATE_LIMITER = HostRateLimiter(
+    host_limits={
+        "www.amazon.ca": (0.5, 1),
+        "www.bestbuy.ca": (2.0, 4),
+    }
+)
@@ -0,0 +1,115 @@
+"""
+Production entry point: gunicorn with a preloaded app, so workers share model weights.
+
+The gunicorn master imports the app (`preload_app`), loads every model and pre-warms the
+caches, then forks `--workers` gthread workers, each serving `--threads` requests at once.
+Workers inherit the loaded models copy-on-write, so N workers use close to one copy of model
+memory instead of N. In each worker, the `post_fork` hook limits torch to `--torch-threads`
+intra-op threads so workers do not oversubscribe the cores, starts the background job
+workers, and takes a 1/N share of the per-host scraping rate and burst limits.
+
+Async jobs are polled through any worker, so a shared job store is required; JOB_STORE_PATH
+defaults to cache/jobs.sqlite3 here.
+
+Usage:
+    python src/serve.py --workers 4 --port 5001
+"""
+import argparse
+import gc
+import os
+import time
+
+# Must be set before the app (and the tokenizers it loads) is imported
+os.environ["PREFORK_SERVER"] = "1"
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")  # Tokenizer thread pools do not survive fork()
+os.environ.setdefault("JOB_STORE_PATH", os.path.join(os.getcwd(), "cache", "jobs.sqlite3"))
+
+import torch  # noqa: E402
+from gunicorn.app.base import BaseApplication  # noqa: E402
+
+from logger_config import get_logger  # noqa: E402
+from scrapers.rate_limiter import RATE_LIMITER  # noqa: E402
+
+logger = get_logger(__name__)
+
+
+def load_shared_state():
+    """
+    Import the app, load models and warm caches in the master so workers inherit them.
+
+    Returns:
+        module: The imported `app` module.
+    """
+    # Inference in the master stays single-threaded: an OpenMP pool started before fork()
+    # can deadlock in the children
+    torch.set_num_threads(1)
+    start = time.perf_counter()
+    import app as app_module
+    app_module.scraper_manager.warm_up(background=False)
+    if app_module.CLASSIFIER_WARM_TERMS_FILE:
+        app_module.warm_up()
+    # Move everything allocated so far out of the GC's reach: collections in the workers would
+    # otherwise touch (and so copy) every page holding a tracked object
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Loaded shared state in {time.perf_counter() - start:.2f}s; {gc.get_freeze_count()} objects frozen")
+    return app_module
+
+
+class PreforkServer(BaseApplication):
+    """
+    Gunicorn application that preloads the Flask app and sets up each forked worker.
+    """
+    def __init__(self, workers, threads, torch_threads, bind, backlog):
+        self.workers = workers
+        self.torch_threads = torch_threads
+        self.options = {
+            "bind": bind,
+            "workers": workers,
+            "worker_class": "gthread",
+            "threads": threads,
+            "backlog": backlog,
+            "preload_app": True,
+            "post_fork": self.post_fork,
+        }
+        self.app_module = None
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # With preload_app this runs once, in the master, before any worker is forked
+        if self.app_module is None:
+            self.app_module = load_shared_state()
+        return self.app_module.app
+
+    def post_fork(self, server, worker):
+        torch.set_num_threads(self.torch_threads)
+        RATE_LIMITER.scale(1 / self.workers)
+        # Only the first worker ever spawned resumes unfinished jobs, so each is resumed once
+        self.app_module.start_background_services(resume_jobs=(worker.age == 1))
+        logger.info(f"Worker {worker.age} (pid {os.getpid()}) serving with {self.torch_threads} torch threads")
+
+
+def main():
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Gunicorn server sharing model weights across workers.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5001)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_WORKERS", "2")))
+    parser.add_argument("--threads", type=int, default=int(os.environ.get("WEB_THREADS", "8")),
+                        help="Requests served concurrently by each worker")
+    parser.add_argument("--torch-threads", type=int, default=int(os.environ.get("TORCH_THREADS", "0")),
+                        help="Intra-op threads per worker (default: cores / workers)")
+    parser.add_argument("--backlog", type=int, default=128)
+    args = parser.parse_args()
+    torch_threads = args.torch_threads or max(1, cpu_count // args.workers)
+
+    logger.info(f"Starting gunicorn on {args.host}:{args.port} with {args.workers} workers x {args.threads} threads")
+    PreforkServer(args.workers, args.threads, torch_threads, f"{args.host}:{args.port}", args.backlog).run()
+
+
+if __name__ == "__main__":
+    main()
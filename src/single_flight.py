@@ -0,0 +1,53 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it is in flight
+    wait for and receive the same result (or exception). Once the call finishes the key is
+    released, so later callers trigger a new call.
+    """
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Run `fn()` for `key`, or join an in-flight call for the same key.
+
+        Args:
+            key: Hashable deduplication key.
+            fn (callable): Zero-argument function to run.
+
+        Returns:
+            The result of the shared call.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._calls)}
@@ -0,0 +1,59 @@
+import re
+import unicodedata
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_search_term(search_term: str) -> str:
+    """
+    Normalize a search term so trivially different spellings share cache entries.
+
+    Folds case and Unicode compatibility forms, replaces punctuation with spaces and
+    collapses runs of whitespace, e.g. "  Laptop!! " and "laptop" both become "laptop".
+
+    Args:
+        search_term (str): The raw search term.
+
+    Returns:
+        str: The normalized term.
+    """
+    term = unicodedata.normalize("NFKC", search_term).casefold()
+    term = _NON_WORD.sub(" ", term)
+    return _WHITESPACE.sub(" ", term).strip()
+
+
+def lexical_tokens(text: str) -> set:
+    """
+    Split text into normalized word tokens for cheap overlap checks.
+
+    Tokens are normalized like search terms, and a trailing plural "s" is dropped from
+    longer words so "headphones" and "headphone" match.
+
+    Args:
+        text (str): Search term or product text.
+
+    Returns:
+        set: The distinct tokens.
+    """
+    return {
+        token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+        for token in normalize_search_term(text).split()
+    }
+
+
+def lexical_overlap(query_tokens: set, text: str) -> float:
+    """
+    Score how much of a query a text covers: the fraction of `query_tokens` found among the
+    text's `lexical_tokens`.
+
+    Args:
+        query_tokens (set): Tokens of the search term, from `lexical_tokens`.
+        text (str): Product text.
+
+    Returns:
+        float: From 0.0 (no query token present) to 1.0 (all present); 0.0 for an empty query.
+    """
+    if not query_tokens:
+        return 0.0
+    return len(query_tokens & lexical_tokens(text)) / len(query_tokens)